@@ -1,100 +1,1026 @@
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+import argparse
+import asyncio
 import json
 import re
 import time
-import pandas as pd
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import requests
 import os
-from multiprocessing import Pool, Manager
+import multiprocessing
+from queue import Queue, Empty
+from multiprocessing import Pool
+from multiprocessing.managers import SyncManager
 from tqdm import tqdm
 import random
+import hashlib
+import bisect
+import functools
+import contextvars
+import cProfile
+import pstats
+import logging
+import logging.handlers
+import sys
+import importlib.util
+import signal
+import sqlite3
+from decimal import Decimal, ROUND_HALF_UP
 import psycopg2
-from psycopg2.extras import DictCursor
-from urllib.parse import urlparse
+import psycopg2.pool
+from psycopg2.extras import DictCursor, execute_values
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from urllib.parse import urlparse, parse_qsl, urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 from dotenv import load_dotenv
 load_dotenv()
 
-# Global set to cache downloaded images
-downloaded_images = set()
+# Image stage: workers queue (image key, URL) pairs for the parent, which downloads
+# them off the scraping path and stores each distinct image once under its hash
+IMAGE_DIR = os.getenv("SCRAPER_IMAGE_DIR", "src/assets")
+IMAGE_BLOB_DIR = os.path.join(IMAGE_DIR, "blobs")
+IMAGE_MANIFEST_PATH = os.getenv("SCRAPER_IMAGE_MANIFEST", os.path.join(IMAGE_DIR, "image_manifest.json"))
+IMAGE_DOWNLOAD_CONCURRENCY = int(os.getenv("SCRAPER_IMAGE_CONCURRENCY", "8"))
+IMAGE_DOWNLOAD_RETRIES = int(os.getenv("SCRAPER_IMAGE_RETRIES", "3"))
+_image_queue = None
+_queued_images = set()
 
-def get_db_connection():
-    """Establish a connection to the PostgreSQL database."""
+# Per-host adaptive rate limit shared by all workers: a token bucket whose rate grows
+# while the host answers quickly and halves on timeouts, 429s and 5xx responses
+RATE_INITIAL = float(os.getenv("SCRAPER_RATE_INITIAL", "2"))
+RATE_MIN = float(os.getenv("SCRAPER_RATE_MIN", "0.2"))
+RATE_MAX = float(os.getenv("SCRAPER_RATE_MAX", "10"))
+RATE_BURST = float(os.getenv("SCRAPER_RATE_BURST", "2"))
+RATE_INCREASE = float(os.getenv("SCRAPER_RATE_INCREASE", "0.1"))
+RATE_TARGET_LATENCY = float(os.getenv("SCRAPER_RATE_TARGET_LATENCY", "3"))
+MAX_RETRIES = int(os.getenv("SCRAPER_MAX_RETRIES", "3"))
+RETRY_BUDGET_RATIO = float(os.getenv("SCRAPER_RETRY_BUDGET_RATIO", "0.1"))
+BACKOFF_BASE = float(os.getenv("SCRAPER_BACKOFF_BASE", "1"))
+BACKOFF_MAX = float(os.getenv("SCRAPER_BACKOFF_MAX", "60"))
+TRANSIENT_STATUSES = {429, 500, 502, 503, 504}
+_rate_state = {}
+_rate_lock = threading.Lock()
+
+# Resized WebP derivatives of each stored image, keyed by the source's hash
+DERIVATIVE_DIR = os.path.join(IMAGE_DIR, "derived")
+DERIVATIVE_MANIFEST_PATH = os.getenv("SCRAPER_DERIVATIVE_MANIFEST", os.path.join(IMAGE_DIR, "derivatives_manifest.json"))
+DERIVATIVE_WIDTHS = [int(width) for width in os.getenv("SCRAPER_DERIVATIVE_WIDTHS", "240,480,960").split(",") if width]
+DERIVATIVE_QUALITY = int(os.getenv("SCRAPER_DERIVATIVE_QUALITY", "80"))
+
+# Browser recycling limits for each pool worker
+BROWSER_MAX_PAGES = int(os.getenv("SCRAPER_BROWSER_MAX_PAGES", "200"))
+BROWSER_MAX_RSS_MB = int(os.getenv("SCRAPER_BROWSER_MAX_RSS_MB", "1500"))
+
+# Per-worker Playwright state, created lazily after the pool forks
+_playwright = None
+_browser = None
+_browser_pages = 0
+browser_stats = {"launches": 0, "launch_seconds": 0.0, "pages": 0, "restarts": 0}
+worker_stats = None
+
+# Per-worker database connection pool
+DB_POOL_MAX_CONNECTIONS = int(os.getenv("SCRAPER_DB_POOL_MAX", "4"))
+DB_HEALTHCHECK_IDLE_SECONDS = float(os.getenv("SCRAPER_DB_HEALTHCHECK_IDLE_SECONDS", "30"))
+_db_pool = None
+_db_pool_lock = threading.Lock()
+# ThreadedConnectionPool raises when exhausted, so threads wait here for a free connection
+_db_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX_CONNECTIONS)
+_db_last_used = {}
+db_stats = {"connects": 0, "checkouts": 0, "health_checks": 0, "reconnects": 0}
+
+# Per-worker LRU cache of club natural key -> club id
+CLUB_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPER_CLUB_CACHE_MAX", "20000"))
+_club_cache = OrderedDict()
+_club_cache_lock = threading.Lock()
+_club_cache_warmed = False
+club_cache_stats = {"hits": 0, "misses": 0, "evictions": 0, "warmed": 0}
+
+# Count of product pages by classified state
+page_state_stats = defaultdict(int)
+
+# Count of product pages served by the static fetch and by the browser
+fetch_tier_stats = defaultdict(int)
+
+# Crawl journal: workers push one record per URL onto a shared queue that the
+# parent appends to SQLite, and stop taking new URLs once shutdown is requested
+JOURNAL_PATH = os.getenv("SCRAPER_JOURNAL_PATH", "crawl_journal.sqlite3")
+_journal_queue = None
+_stop_event = None
+_item_errors = {}
+
+# Result sink: workers queue each item's variants for the parent, which appends them
+# to a per-run JSONL file instead of holding every variant in memory
+RESULTS_DIR = os.getenv("SCRAPER_RESULTS_DIR", "results")
+_result_queue = None
+
+# Change detection: validators and content hashes from earlier runs, keyed by URL,
+# and the ones seen for each URL in this run until the journal records them
+_page_versions = {}
+_item_versions = {}
+
+# Structured logging: every process hands records to a queue drained by one listener
+# thread in the parent, so scraping never blocks on console or file writes
+LOG_LEVEL = os.getenv("SCRAPER_LOG_LEVEL", "INFO").upper()
+LOG_FILE = os.getenv("SCRAPER_LOG_FILE")
+LOG_FLUSH_SECONDS = float(os.getenv("SCRAPER_LOG_FLUSH_SECONDS", "1"))
+log = logging.getLogger("scraper")
+_log_context = contextvars.ContextVar("log_context", default={})
+_log_listener = None
+
+class LogContextFilter(logging.Filter):
+    """Stamp each record with the worker, URL and stage it was logged under."""
+    def filter(self, record):
+        context = _log_context.get()
+        record.worker = context.get("worker", os.getpid())
+        record.url = context.get("url", "")
+        record.stage = context.get("stage", "")
+        return True
+
+class JsonLogFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "worker": getattr(record, "worker", None),
+            "url": getattr(record, "url", ""),
+            "stage": getattr(record, "stage", ""),
+            "msg": record.getMessage()
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that flushes every LOG_FLUSH_SECONDS or on warnings instead of after each record."""
+    def __init__(self, stream):
+        super().__init__(stream)
+        self.last_flush = time.monotonic()
+    
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING or time.monotonic() - self.last_flush >= LOG_FLUSH_SECONDS:
+                self.flush()
+                self.last_flush = time.monotonic()
+        except Exception:
+            self.handleError(record)
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields such as worker, url and stage to every record logged in the block."""
+    token = _log_context.set({**_log_context.get(), **fields})
     try:
-        conn = psycopg2.connect(
-            os.getenv("DATABASE_URL"),
-            cursor_factory=DictCursor
-        )
-        print("Connected to PostgreSQL database successfully")
-        return conn
-    except Exception as e:
-        print(f"Error connecting to PostgreSQL database: {e}")
-        raise
+        yield
+    finally:
+        _log_context.reset(token)
+
+def attach_log_queue(log_queue):
+    """Route this process's scraper logger into the shared log queue."""
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(LogContextFilter())
+    log.handlers = [handler]
+    log.setLevel(LOG_LEVEL)
+    log.propagate = False
+
+def start_logging(level=None, log_file=None):
+    """Start the parent's log listener (console, plus JSON lines to log_file) and return its queue."""
+    global _log_listener, LOG_LEVEL
+    LOG_LEVEL = (level or LOG_LEVEL).upper()
+    log_queue = multiprocessing.Queue(-1)
+    console = BufferedStreamHandler(sys.stderr)
+    console.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(worker)s] %(message)s"))
+    handlers = [console]
+    log_file = log_file or LOG_FILE
+    if log_file:
+        json_handler = BufferedStreamHandler(open(log_file, "a", buffering=1 << 16))
+        json_handler.setFormatter(JsonLogFormatter())
+        handlers.append(json_handler)
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _log_listener.start()
+    attach_log_queue(log_queue)
+    return log_queue
 
-def download_image(image_url, brand, model):
-    """Download the image and save it to src/assets."""
+def stop_logging():
+    """Drain the log queue and flush every handler."""
+    if _log_listener is not None:
+        _log_listener.stop()
+        for handler in _log_listener.handlers:
+            handler.flush()
+
+# Per-stage timing histograms and event counters; each worker publishes its own and
+# the parent merges them into one summary, optionally written as JSON or Prometheus text
+METRICS_BUCKETS = [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60]
+METRICS_PATH = os.getenv("SCRAPER_METRICS_PATH")
+stage_metrics = {}
+run_counters = defaultdict(int)
+_metrics_lock = threading.Lock()
+
+def record_stage(stage, seconds):
+    """Add one timing to a stage's histogram."""
+    with _metrics_lock:
+        metric = stage_metrics.get(stage)
+        if metric is None:
+            metric = stage_metrics[stage] = {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * (len(METRICS_BUCKETS) + 1)}
+        metric["count"] += 1
+        metric["sum"] += seconds
+        metric["max"] = max(metric["max"], seconds)
+        metric["buckets"][bisect.bisect_left(METRICS_BUCKETS, seconds)] += 1
+
+def count_event(event, amount=1):
+    """Increment a run counter."""
+    with _metrics_lock:
+        run_counters[event] += amount
+
+@contextmanager
+def timed_stage(stage):
+    """Time the enclosed block into a stage histogram, even if it raises."""
+    started = time.perf_counter()
     try:
-        image_key = f"{brand.lower().replace(' ', '_')}_{model.lower().replace(' ', '_')}"
-        if image_key in downloaded_images:
-            print(f"Image already downloaded for {brand} {model}")
-            return image_key
-        
-        os.makedirs("src/assets", exist_ok=True)
-        filename = f"{image_key}.jpg"
-        filepath = os.path.join("src/assets", filename)
-        
-        if os.path.exists(filepath):
-            print(f"Image already exists for {brand} {model}: {filepath}")
-            downloaded_images.add(image_key)
-            return image_key
+        with log_context(stage=stage):
+            yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+def timed(stage):
+    """Decorator that times every call of a sync or async function as a stage."""
+    def decorate(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with timed_stage(stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
         
-        response = requests.get(image_url, stream=True, timeout=5)
-        if response.status_code == 200:
-            with open(filepath, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            print(f"Saved image for {brand} {model} to {filepath}")
-            downloaded_images.add(image_key)
-            return image_key
-        else:
-            print(f"Failed to download image for {brand} {model}: HTTP {response.status_code} - URL: {image_url}")
-            return None
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def metrics_snapshot():
+    """Copy this process's stage histograms and counters for publishing."""
+    with _metrics_lock:
+        return {
+            "stages": {stage: dict(metric, buckets=list(metric["buckets"])) for stage, metric in stage_metrics.items()},
+            "counters": dict(run_counters)
+        }
+
+def merge_metrics(stats_by_worker):
+    """Sum every worker's stage histograms and counters."""
+    stages = {}
+    counters = defaultdict(int)
+    for stats in stats_by_worker.values():
+        for stage, metric in stats.get("stages", {}).items():
+            merged = stages.setdefault(stage, {"count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * (len(METRICS_BUCKETS) + 1)})
+            merged["count"] += metric["count"]
+            merged["sum"] += metric["sum"]
+            merged["max"] = max(merged["max"], metric["max"])
+            merged["buckets"] = [a + b for a, b in zip(merged["buckets"], metric["buckets"])]
+        for event, amount in stats.get("counters", {}).items():
+            counters[event] += amount
+    return stages, dict(counters)
+
+def histogram_quantile(metric, quantile):
+    """Estimate a quantile as the upper bound of the bucket it falls in."""
+    target = quantile * metric["count"]
+    seen = 0
+    for bound, count in zip(METRICS_BUCKETS + [metric["max"]], metric["buckets"]):
+        seen += count
+        if seen >= target:
+            return min(bound, metric["max"])
+    return metric["max"]
+
+def format_prometheus(stages, counters):
+    """Render merged metrics in the Prometheus text exposition format."""
+    lines = ["# TYPE scraper_stage_seconds histogram"]
+    for stage, metric in sorted(stages.items()):
+        cumulative = 0
+        for bound, count in zip(METRICS_BUCKETS, metric["buckets"]):
+            cumulative += count
+            lines.append(f'scraper_stage_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+        lines.append(f'scraper_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {metric["count"]}')
+        lines.append(f'scraper_stage_seconds_sum{{stage="{stage}"}} {metric["sum"]}')
+        lines.append(f'scraper_stage_seconds_count{{stage="{stage}"}} {metric["count"]}')
+    lines.append("# TYPE scraper_events_total counter")
+    for event, amount in sorted(counters.items()):
+        lines.append(f'scraper_events_total{{event="{event}"}} {amount}')
+    return "\n".join(lines) + "\n"
+
+def report_stage_metrics(stats_by_worker, path=None):
+    """Print a per-stage timing table and run counters; write them to a .prom or .json file if asked."""
+    stages, counters = merge_metrics(stats_by_worker)
+    if stages:
+        print(f"{'stage':<16}{'count':>8}{'total s':>10}{'mean s':>9}{'p50 s':>8}{'p95 s':>8}{'max s':>8}")
+        for stage, metric in sorted(stages.items(), key=lambda item: -item[1]["sum"]):
+            print(f"{stage:<16}{metric['count']:>8}{metric['sum']:>10.1f}{metric['sum'] / metric['count']:>9.3f}"
+                  f"{histogram_quantile(metric, 0.5):>8.2f}{histogram_quantile(metric, 0.95):>8.2f}{metric['max']:>8.2f}")
+    if counters:
+        print("Counters: " + ", ".join(f"{event}: {amount}" for event, amount in sorted(counters.items())))
+    if path:
+        with open(path, "w") as f:
+            if path.endswith(".prom"):
+                f.write(format_prometheus(stages, counters))
+            else:
+                json.dump({"buckets": METRICS_BUCKETS, "stages": stages, "counters": counters}, f, indent=2)
+        print(f"Metrics written to {path}")
+
+# Opt-in cProfile per worker; each worker rewrites its profile after every item so a
+# terminated pool worker still leaves one behind, and the parent merges them at the end
+PROFILE_DIR = os.getenv("SCRAPER_PROFILE_DIR")
+PROFILE_REPORT_LINES = int(os.getenv("SCRAPER_PROFILE_REPORT_LINES", 40))
+_profiler = None
+_profile_dir = None
+
+def prepare_profile_dir(profile_dir):
+    """Create the profile directory and drop worker profiles left over from an earlier run."""
+    os.makedirs(profile_dir, exist_ok=True)
+    for filename in os.listdir(profile_dir):
+        if filename.startswith("worker_") and filename.endswith(".prof"):
+            os.remove(os.path.join(profile_dir, filename))
+
+def start_worker_profiler(profile_dir):
+    """Start profiling this process into <profile_dir>/worker_<pid>.prof."""
+    global _profiler, _profile_dir
+    if not profile_dir or _profiler is not None:
+        return
+    _profile_dir = profile_dir
+    _profiler = cProfile.Profile()
+    _profiler.enable()
+
+def dump_worker_profile():
+    """Write this worker's profile so far, then keep profiling."""
+    if _profiler is None:
+        return
+    _profiler.dump_stats(os.path.join(_profile_dir, f"worker_{os.getpid()}.prof"))
+    _profiler.enable()
+
+def stop_worker_profiler():
+    """Write this process's final profile and stop profiling."""
+    global _profiler
+    if _profiler is None:
+        return
+    dump_worker_profile()
+    _profiler.disable()
+    _profiler = None
+
+def report_profiles(profile_dir, report_lines=PROFILE_REPORT_LINES):
+    """Merge the worker profiles into merged.prof plus a text report, and print the top functions."""
+    paths = sorted(os.path.join(profile_dir, filename) for filename in os.listdir(profile_dir)
+                   if filename.startswith("worker_") and filename.endswith(".prof"))
+    if not paths:
+        log.warning(f"No worker profiles found in {profile_dir}")
+        return None
+    merged_path = os.path.join(profile_dir, "merged.prof")
+    report_path = os.path.join(profile_dir, "report.txt")
+    pstats.Stats(*paths).dump_stats(merged_path)
+    with open(report_path, "w") as f:
+        stats = pstats.Stats(merged_path, stream=f)
+        f.write(f"Merged from {len(paths)} worker profiles\n")
+        stats.sort_stats("cumulative").print_stats(report_lines)
+        stats.sort_stats("tottime").print_stats(report_lines)
+        stats.sort_stats("cumulative").print_callers(report_lines)
+    stats = pstats.Stats(merged_path, stream=sys.stdout)
+    stats.strip_dirs().sort_stats("tottime").print_stats(min(report_lines, 20))
+    print(f"Merged {len(paths)} worker profiles into {merged_path} (report: {report_path})")
+    return merged_path
+
+class CountingCursor(DictCursor):
+    """DictCursor that counts each statement sent to the server."""
+    def execute(self, query, vars=None):
+        count_event("db_round_trips")
+        return super().execute(query, vars)
+
+def get_db_pool():
+    """Return this worker's connection pool, creating it on first use."""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is None:
+            _db_pool = psycopg2.pool.ThreadedConnectionPool(
+                1, DB_POOL_MAX_CONNECTIONS,
+                os.getenv("DATABASE_URL"),
+                cursor_factory=CountingCursor
+            )
+        return _db_pool
+
+def connection_is_healthy(conn):
+    """Check a pooled connection before reuse, pinging it if it sat idle too long."""
+    if conn.closed:
+        return False
+    last_used = _db_last_used.get(id(conn))
+    if last_used is None or time.monotonic() - last_used < DB_HEALTHCHECK_IDLE_SECONDS:
+        return True
+    db_stats["health_checks"] += 1
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.fetchone()
+        cur.close()
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+@contextmanager
+def db_connection(process_id):
+    """Check out a healthy pooled connection, reconnecting if the pooled one has died."""
+    with _db_pool_slots:
+        pool = get_db_pool()
+        conn = pool.getconn()
+        db_stats["checkouts"] += 1
+        if id(conn) not in _db_last_used:
+            db_stats["connects"] += 1
+        elif not connection_is_healthy(conn):
+            log.warning("Pooled database connection failed health check, reconnecting")
+            _db_last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+            db_stats["reconnects"] += 1
+            db_stats["connects"] += 1
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            if not broken and not conn.closed:
+                try:
+                    if conn.status != psycopg2.extensions.STATUS_READY:
+                        conn.rollback()
+                except psycopg2.Error:
+                    broken = True
+            if broken or conn.closed:
+                _db_last_used.pop(id(conn), None)
+                pool.putconn(conn, close=True)
+            else:
+                _db_last_used[id(conn)] = time.monotonic()
+                pool.putconn(conn)
+
+def report_db_stats(stats_by_worker):
+    """Print how often pooled database connections were reused instead of reopened."""
+    checkouts = sum(s["db"]["checkouts"] for s in stats_by_worker.values())
+    connects = sum(s["db"]["connects"] for s in stats_by_worker.values())
+    health_checks = sum(s["db"]["health_checks"] for s in stats_by_worker.values())
+    reconnects = sum(s["db"]["reconnects"] for s in stats_by_worker.values())
+    if not checkouts:
+        return
+    reuse_rate = (checkouts - connects) / checkouts * 100
+    print(f"Database pool: {connects} connections for {checkouts} checkouts ({reuse_rate:.1f}% reused), "
+          f"{health_checks} health checks, {reconnects} reconnects")
+
+def image_path(image_key):
+    """Return the path the frontend loads a club image from."""
+    return os.path.join(IMAGE_DIR, f"{image_key}.jpg")
+
+def new_image_session(max_connections):
+    """Create a pooled session that retries transient image download failures."""
+    session = requests.Session()
+    retry = Retry(total=IMAGE_DOWNLOAD_RETRIES, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": CONTEXT_OPTIONS["user_agent"]})
+    return session
+
+def store_image(image_key, content):
+    """Store image bytes once under their SHA-256 and link the image key's filename to them."""
+    digest = hashlib.sha256(content).hexdigest()
+    os.makedirs(IMAGE_BLOB_DIR, exist_ok=True)
+    blob_path = os.path.join(IMAGE_BLOB_DIR, f"{digest}.jpg")
+    reused = os.path.exists(blob_path)
+    if not reused:
+        tmp_path = f"{blob_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, blob_path)
+    
+    key_path = image_path(image_key)
+    if not (os.path.exists(key_path) and os.path.samefile(key_path, blob_path)):
+        tmp_path = f"{key_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.link(blob_path, tmp_path)
+        except OSError:
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+        os.replace(tmp_path, key_path)
+    return digest, reused
+
+def queue_image_download(image_key, image_url):
+    """Hand an image to the parent's image stage, or download it inline without one."""
+    if image_key in _queued_images:
+        return True
+    _queued_images.add(image_key)
+    if _image_queue is not None:
+        _image_queue.put((image_key, image_url))
+        return True
+    if os.path.exists(image_path(image_key)):
+        return True
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    try:
+        response = requests.get(mirror_url(image_url), timeout=5)
+        response.raise_for_status()
+        store_image(image_key, response.content)
+        return True
     except Exception as e:
-        print(f"Error downloading image for {brand} {model}: {e} - URL: {image_url}")
+        log.error(f"Error downloading image {image_key}: {e} - URL: {image_url}")
+        return False
+
+def load_image_manifest(path=IMAGE_MANIFEST_PATH):
+    """Load the image-key -> URL/hash manifest from earlier runs."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"images": {}}
+
+def save_image_manifest(manifest, path=IMAGE_MANIFEST_PATH):
+    """Write the image manifest atomically."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def run_image_stage(image_queue, manifest):
+    """Download queued images on a bounded thread pool until a None sentinel arrives."""
+    stats = defaultdict(int)
+    lock = threading.Lock()
+    session = new_image_session(IMAGE_DOWNLOAD_CONCURRENCY)
+    images = manifest.setdefault("images", {})
+    os.makedirs(IMAGE_DIR, exist_ok=True)
+    
+    def fetch(image_key, image_url):
+        try:
+            with timed_stage("image_download"):
+                response = session.get(mirror_url(image_url), timeout=10)
+            response.raise_for_status()
+            digest, reused = store_image(image_key, response.content)
+        except Exception as e:
+            log.error(f"Error downloading image {image_key}: {e} - URL: {image_url}")
+            with lock:
+                stats["failed"] += 1
+            return
+        with lock:
+            images[image_key] = {"url": image_url, "sha256": digest, "bytes": len(response.content)}
+            stats["deduplicated" if reused else "downloaded"] += 1
+    
+    seen = set()
+    with ThreadPoolExecutor(max_workers=IMAGE_DOWNLOAD_CONCURRENCY) as executor:
+        while True:
+            item = image_queue.get()
+            if item is None:
+                break
+            image_key, image_url = item
+            if image_key in seen:
+                continue
+            seen.add(image_key)
+            known = images.get(image_key)
+            if os.path.exists(image_path(image_key)) and (known is None or known["url"] == image_url):
+                stats["skipped"] += 1
+                continue
+            executor.submit(fetch, image_key, image_url)
+    
+    save_image_manifest(manifest)
+    print(f"Images: {stats['downloaded']} downloaded, {stats['deduplicated']} identical to a stored image, "
+          f"{stats['skipped']} already stored, {stats['failed']} failed")
+
+def file_sha256(path):
+    """Hash a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def render_derivatives(task):
+    """Pool task: write the WebP widths for one source image and return their manifest entries."""
+    from PIL import Image
+    
+    source_hash, source_path = task
+    os.makedirs(DERIVATIVE_DIR, exist_ok=True)
+    try:
+        image = Image.open(source_path)
+        image.load()
+    except Exception as e:
+        log.error(f"Error reading image {source_path}: {e}")
+        return source_hash, None
+    with image:
+        image = image.convert("RGB")
+        source_width, source_height = image.size
+        widths = [width for width in DERIVATIVE_WIDTHS if width < source_width] or [source_width]
+        derivatives = []
+        for width in widths:
+            height = max(1, round(source_height * width / source_width))
+            path = os.path.join(DERIVATIVE_DIR, f"{source_hash}-{width}.webp")
+            image.resize((width, height), Image.LANCZOS).save(path, "WEBP", quality=DERIVATIVE_QUALITY, method=6)
+            derivatives.append({"width": width, "height": height, "path": path, "bytes": os.path.getsize(path)})
+    return source_hash, {"width": source_width, "height": source_height, "derivatives": derivatives}
+
+def derivatives_up_to_date(entry, source_hash):
+    """Check that a manifest entry was built from this source and its files still exist."""
+    return (
+        entry is not None
+        and entry["source_sha256"] == source_hash
+        and entry["widths"] == DERIVATIVE_WIDTHS
+        and all(os.path.exists(derivative["path"]) for derivative in entry["derivatives"])
+    )
+
+def build_image_derivatives(num_processes=8, path=DERIVATIVE_MANIFEST_PATH):
+    """Build WebP derivatives for every image in src/assets, skipping sources that have not changed."""
+    if importlib.util.find_spec("PIL") is None:
+        log.info("Pillow is not installed, skipping image derivatives")
         return None
+    try:
+        with open(path, "r") as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        manifest = {}
+    
+    sources = {}
+    for filename in sorted(os.listdir(IMAGE_DIR)) if os.path.isdir(IMAGE_DIR) else []:
+        if filename.endswith(".jpg"):
+            image_key = filename[:-len(".jpg")]
+            sources[image_key] = file_sha256(image_path(image_key))
+    
+    stale = {
+        source_hash: image_path(image_key)
+        for image_key, source_hash in sources.items()
+        if not derivatives_up_to_date(manifest.get(image_key), source_hash)
+    }
+    log.debug(f"Image derivatives: {len(sources)} images, {len(stale)} distinct sources to render")
+    
+    rendered = {}
+    if stale:
+        with Pool(processes=max(1, min(num_processes, len(stale))), initializer=ignore_interrupts) as pool:
+            for source_hash, entry in tqdm(pool.imap_unordered(render_derivatives, stale.items()),
+                                           total=len(stale), desc="Rendering image derivatives"):
+                rendered[source_hash] = entry
+    
+    updated = {}
+    for image_key, source_hash in sources.items():
+        if rendered.get(source_hash):
+            updated[image_key] = {"source_sha256": source_hash, "widths": DERIVATIVE_WIDTHS, **rendered[source_hash]}
+        elif source_hash not in stale:
+            updated[image_key] = manifest[image_key]
+    manifest = updated
+    save_image_manifest(manifest, path)
+    source_bytes = sum(os.path.getsize(image_path(image_key)) for image_key in manifest)
+    smallest_bytes = sum(min(d["bytes"] for d in entry["derivatives"]) for entry in manifest.values())
+    if source_bytes:
+        print(f"Image derivatives written to {path}: smallest widths total {smallest_bytes / 1024:.0f} KB "
+              f"vs {source_bytes / 1024:.0f} KB of originals ({smallest_bytes / source_bytes:.0%})")
+    return manifest
+
+def ignore_interrupts():
+    """Leave Ctrl-C to the parent so it can shut the crawl down gracefully.
+
+    SIGTERM goes back to its default: forked workers inherit the parent's shutdown
+    handler, and Pool.terminate() SIGTERMs them at the end of every run.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+def init_worker(shared_stats, journal_queue=None, stop_event=None, page_versions=None, image_queue=None,
+                rate_state=None, rate_lock=None, result_queue=None, log_queue=None, profile_dir=None):
+    """Pool initializer: keep handles on the shared stats, queues, stop flag, page versions and rate limits."""
+    global worker_stats, _journal_queue, _stop_event, _page_versions, _image_queue, _rate_state, _rate_lock, _result_queue
+    worker_stats = shared_stats
+    if log_queue is not None:
+        attach_log_queue(log_queue)
+    _result_queue = result_queue
+    if rate_state is not None:
+        _rate_state, _rate_lock = rate_state, rate_lock
+    _image_queue = image_queue
+    _journal_queue = journal_queue
+    _stop_event = stop_event
+    _page_versions = page_versions or {}
+    start_worker_profiler(profile_dir)
+    if multiprocessing.parent_process() is not None:
+        ignore_interrupts()
+
+def stop_requested():
+    """Check whether the parent has asked the crawl to stop."""
+    return _stop_event is not None and _stop_event.is_set()
+
+def emit_results(variants):
+    """Queue an item's variants for the parent's result sink."""
+    if _result_queue is not None and variants:
+        _result_queue.put(variants)
 
-def determine_club_type_from_page(page):
-    """Determine the club type from the category link on the product page."""
+def journal_item(name, url, process_id, started, variants):
+    """Queue this URL's outcome for the crawl journal."""
+    if _journal_queue is None:
+        return
+    error = _item_errors.pop(url, None)
+    version = _item_versions.pop(url, {})
+    _journal_queue.put({
+        "url": url,
+        "name": name,
+        "status": "failed" if error else "unchanged" if version.get("unchanged") else "done",
+        "process_id": process_id,
+        "started_at": started,
+        "seconds": time.time() - started,
+        "variant_count": len(variants),
+        "error": error,
+        "etag": version.get("etag"),
+        "last_modified": version.get("last_modified"),
+        "content_hash": version.get("content_hash")
+    })
+
+def get_browser_rss_mb():
+    """Return the combined RSS of this worker and its driver/Chromium children in MB."""
+    try:
+        import psutil
+    except ImportError:
+        return None
     try:
-        category_link = page.query_selector("li.item.product_type a")
-        if category_link:
-            category_title = category_link.get_attribute("title")
-            if category_title:
-                category_title = category_title.lower()
-                if "drivers" in category_title:
-                    return "Driver"
-                elif "fairway woods" in category_title:
-                    return "Fairway Wood"
-                elif "hybrids & utility irons" in category_title:
-                    return "Hybrid"
-                elif "iron sets" in category_title:
-                    return "Iron Set"
-                elif "wedges" in category_title:
-                    return "Wedge"
-                elif "putters" in category_title:
-                    return "Putter"
-                elif "club sets" in category_title:
-                    return "Club Set"
-                else:
-                    print(f"Unknown category title: {category_title}")
-                    return "Unknown"
-        print("No category link found on page")
+        proc = psutil.Process()
+        rss = proc.memory_info().rss
+        for child in proc.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return rss / (1024 * 1024)
+    except psutil.Error:
+        return None
+
+def close_worker_browser():
+    """Close the worker's browser, keeping the Playwright driver running."""
+    global _browser, _browser_pages
+    if _browser:
+        try:
+            _browser.close()
+        except Exception as e:
+            log.error(f"Error closing browser: {e}")
+    _browser = None
+    _browser_pages = 0
+
+def get_worker_browser(process_id):
+    """Return this worker's Chromium instance, launching or recycling it as needed."""
+    global _playwright, _browser
+    if _browser and _browser_pages >= BROWSER_MAX_PAGES:
+        log.warning(f"Restarting browser after {_browser_pages} pages")
+        close_worker_browser()
+        browser_stats["restarts"] += 1
+    elif _browser and BROWSER_MAX_RSS_MB:
+        rss_mb = get_browser_rss_mb()
+        if rss_mb and rss_mb > BROWSER_MAX_RSS_MB:
+            log.warning(f"Restarting browser at {rss_mb:.0f} MB RSS")
+            close_worker_browser()
+            browser_stats["restarts"] += 1
+    if _browser and not _browser.is_connected():
+        log.warning("Browser disconnected, relaunching")
+        close_worker_browser()
+    if not _browser:
+        if not _playwright:
+            _playwright = sync_playwright().start()
+        start = time.perf_counter()
+        _browser = _playwright.chromium.launch(headless=True)
+        browser_stats["launches"] += 1
+        browser_stats["launch_seconds"] += time.perf_counter() - start
+    return _browser
+
+def release_worker_browser():
+    """Count a finished page against the browser."""
+    global _browser_pages
+    _browser_pages += 1
+    browser_stats["pages"] += 1
+
+def worker_stats_snapshot():
+    """Copy this worker's counters."""
+    return {
+        "browser": dict(browser_stats),
+        "db": dict(db_stats),
+        "club_cache": dict(club_cache_stats),
+        "page_states": dict(page_state_stats),
+        "fetch_tiers": dict(fetch_tier_stats),
+        **metrics_snapshot()
+    }
+
+def publish_worker_stats(snapshot=None):
+    """Copy this worker's counters into the shared stats dict, once per item."""
+    if worker_stats is not None:
+        worker_stats[os.getpid()] = snapshot or worker_stats_snapshot()
+
+def report_browser_stats(stats_by_worker):
+    """Print browser launch totals and the launch time saved by reusing browsers."""
+    launches = sum(s["browser"]["launches"] for s in stats_by_worker.values())
+    pages = sum(s["browser"]["pages"] for s in stats_by_worker.values())
+    launch_seconds = sum(s["browser"]["launch_seconds"] for s in stats_by_worker.values())
+    restarts = sum(s["browser"]["restarts"] for s in stats_by_worker.values())
+    if not launches:
+        return
+    avg_launch = launch_seconds / launches
+    saved = (pages - launches) * avg_launch
+    print(f"Browser pool: {len(stats_by_worker)} workers, {launches} launches ({restarts} restarts) for {pages} pages, "
+          f"avg launch {avg_launch:.2f}s, ~{saved:.0f}s of launch time saved")
+
+CONTEXT_OPTIONS = {
+    "user_agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "accept_downloads": True,
+    "extra_http_headers": {
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.5"
+    }
+}
+
+# Request routing policy: we only read DOM text and the product image src,
+# so images, media, fonts and third-party tracking never need to load.
+BLOCK_RESOURCES = os.getenv("SCRAPER_BLOCK_RESOURCES", "1") != "0"
+BLOCKED_RESOURCE_TYPES = set(filter(None, os.getenv("SCRAPER_BLOCK_RESOURCE_TYPES", "image,media,font").split(",")))
+BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "hotjar.com",
+    "hs-scripts.com",
+    "hs-analytics.net",
+    "hs-banner.com",
+    "hsleadflows.net",
+    "hscollectedforms.net",
+    "hsadspixel.net",
+    "usemessages.com",
+    "trustpilot.com",
+    "tiktok.com",
+    "pinterest.com"
+] + list(filter(None, os.getenv("SCRAPER_BLOCK_HOSTS", "").split(",")))
+ALLOWED_HOSTS = list(filter(None, os.getenv("SCRAPER_ALLOW_HOSTS", "").split(",")))
+ALLOWED_RESOURCE_TYPES = set(filter(None, os.getenv("SCRAPER_ALLOW_RESOURCE_TYPES", "").split(",")))
+
+# Fetch every page, request and image from a mirror (e.g. benchmark_scraper.py's fixture
+# server) instead of the live hosts; the mirror gets the original host as its first path segment
+SITE_MIRROR = os.getenv("SCRAPER_SITE_MIRROR", "").rstrip("/")
+
+def mirror_url(url):
+    """Map a URL onto SITE_MIRROR as <mirror>/<host><path>?<query>; unchanged when no mirror is set."""
+    if not SITE_MIRROR:
+        return url
+    parsed = urlparse(url)
+    return f"{SITE_MIRROR}/{parsed.netloc}{parsed.path or '/'}" + (f"?{parsed.query}" if parsed.query else "")
+
+# Rough transfer sizes used to estimate what blocked requests would have cost
+ESTIMATED_RESOURCE_BYTES = {"image": 60_000, "media": 500_000, "font": 40_000, "script": 50_000, "stylesheet": 20_000}
+ESTIMATED_OTHER_BYTES = 5_000
+
+# Load More requests get their page size raised so each round returns more rows
+LOAD_MORE_PAGE_SIZE = int(os.getenv("SCRAPER_LOAD_MORE_PAGE_SIZE", "200"))
+LOAD_MORE_URL_PATTERN = re.compile(os.getenv("SCRAPER_LOAD_MORE_URL_PATTERN", "alternative"), re.IGNORECASE)
+PAGE_SIZE_PARAMS = ("limit", "page_size", "pageSize", "per_page", "size", "count", "product_list_limit")
+# Widening a numbered page past page 1 would skip rows, so those requests are left alone
+PAGE_NUMBER_PARAMS = ("p", "page", "page_number", "pageNumber", "currentPage")
+
+def widen_page_size(resource_type, url):
+    """Return the Load More request URL with a larger page size, or None to leave it alone."""
+    if not LOAD_MORE_PAGE_SIZE or resource_type not in ("xhr", "fetch") or not LOAD_MORE_URL_PATTERN.search(url):
+        return None
+    parsed = urlparse(url)
+    params = parse_qsl(parsed.query, keep_blank_values=True)
+    if any(key in PAGE_NUMBER_PARAMS and value not in ("", "0", "1") for key, value in params):
+        return None
+    widened = False
+    for i, (key, value) in enumerate(params):
+        if key in PAGE_SIZE_PARAMS and value.isdigit() and int(value) < LOAD_MORE_PAGE_SIZE:
+            params[i] = (key, str(LOAD_MORE_PAGE_SIZE))
+            widened = True
+    return parsed._replace(query=urlencode(params)).geturl() if widened else None
+
+def host_matches(host, domains):
+    """Check whether a host is one of the domains or a subdomain of one."""
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+def should_block_request(resource_type, url):
+    """Decide whether the request router aborts a request."""
+    host = urlparse(url).hostname or ""
+    if SUPPRESS_POPUPS and host_matches(host, POPUP_SOURCE_HOSTS):
+        return True
+    if not BLOCK_RESOURCES:
+        return False
+    if resource_type in ALLOWED_RESOURCE_TYPES or host_matches(host, ALLOWED_HOSTS):
+        return False
+    return resource_type in BLOCKED_RESOURCE_TYPES or host_matches(host, BLOCKED_HOSTS)
+
+def record_blocked_request(router_stats, resource_type):
+    """Count a blocked request and its estimated transfer size."""
+    router_stats["blocked"] += 1
+    router_stats["estimated_bytes"] += ESTIMATED_RESOURCE_BYTES.get(resource_type, ESTIMATED_OTHER_BYTES)
+    router_stats["by_type"][resource_type] += 1
+
+def new_router_stats():
+    """Return an empty per-page request router tally."""
+    return {"blocked": 0, "allowed": 0, "widened": 0, "estimated_bytes": 0, "by_type": defaultdict(int)}
+
+def install_request_router(context):
+    """Abort unneeded requests on every page of the context; return the page's tally."""
+    router_stats = new_router_stats()
+    if not BLOCK_RESOURCES and not SUPPRESS_POPUPS and not LOAD_MORE_PAGE_SIZE and not SITE_MIRROR:
+        return router_stats
+    
+    def handle_route(route):
+        request = route.request
+        if should_block_request(request.resource_type, request.url):
+            record_blocked_request(router_stats, request.resource_type)
+            route.abort()
+            return
+        router_stats["allowed"] += 1
+        widened_url = widen_page_size(request.resource_type, request.url)
+        if widened_url:
+            router_stats["widened"] += 1
+        if SITE_MIRROR:
+            try:
+                route.fulfill(response=route.fetch(url=mirror_url(widened_url or request.url)))
+            except Exception:
+                route.abort()
+        elif widened_url:
+            route.continue_(url=widened_url)
+        else:
+            route.continue_()
+    
+    context.route("**/*", handle_route)
+    return router_stats
+
+async def install_request_router_async(context):
+    """Async counterpart of install_request_router."""
+    router_stats = new_router_stats()
+    if not BLOCK_RESOURCES and not SUPPRESS_POPUPS and not LOAD_MORE_PAGE_SIZE and not SITE_MIRROR:
+        return router_stats
+    
+    async def handle_route(route):
+        request = route.request
+        if should_block_request(request.resource_type, request.url):
+            record_blocked_request(router_stats, request.resource_type)
+            await route.abort()
+            return
+        router_stats["allowed"] += 1
+        widened_url = widen_page_size(request.resource_type, request.url)
+        if widened_url:
+            router_stats["widened"] += 1
+        if SITE_MIRROR:
+            try:
+                await route.fulfill(response=await route.fetch(url=mirror_url(widened_url or request.url)))
+            except Exception:
+                await route.abort()
+        elif widened_url:
+            await route.continue_(url=widened_url)
+        else:
+            await route.continue_()
+    
+    await context.route("**/*", handle_route)
+    return router_stats
+
+def log_router_stats(router_stats, url, process_id):
+    """Report what the request router saved on one page."""
+    if router_stats["widened"]:
+        log.debug(f"Raised the page size of {router_stats['widened']} Load More requests to {LOAD_MORE_PAGE_SIZE} on {url}")
+    if not router_stats["blocked"]:
+        return
+    by_type = ", ".join(f"{resource_type}: {count}" for resource_type, count in sorted(router_stats["by_type"].items()))
+    log.debug(f"Blocked {router_stats['blocked']} of {router_stats['blocked'] + router_stats['allowed']} requests "
+          f"(~{router_stats['estimated_bytes'] / 1024:.0f} KB saved; {by_type}) on {url}")
+
+def new_scrape_context(browser):
+    """Create a fresh, isolated browser context for one product page."""
+    context = browser.new_context(**CONTEXT_OPTIONS)
+    if SUPPRESS_POPUPS:
+        context.add_init_script(POPUP_SUPPRESSION_JS)
+    return context
+
+def club_type_from_category_title(category_title):
+    """Map a product category link title to a club type."""
+    if not category_title:
+        log.warning("No category link found on page")
         return "Unknown"
-    except Exception as e:
-        print(f"Error determining club type from page: {e}")
+    category_title = category_title.lower()
+    if "drivers" in category_title:
+        return "Driver"
+    elif "fairway woods" in category_title:
+        return "Fairway Wood"
+    elif "hybrids & utility irons" in category_title:
+        return "Hybrid"
+    elif "iron sets" in category_title:
+        return "Iron Set"
+    elif "wedges" in category_title:
+        return "Wedge"
+    elif "putters" in category_title:
+        return "Putter"
+    elif "club sets" in category_title:
+        return "Club Set"
+    else:
+        log.warning(f"Unknown category title: {category_title}")
         return "Unknown"
 
 def infer_type_from_specific_type(specific_type, description, club_type, process_id):
@@ -126,86 +1052,101 @@ def infer_type_from_specific_type(specific_type, description, club_type, process
     elif "wood" in description_lower:
         return "Fairway Wood"
     
-    print(f"Process {process_id} - Warning: Could not infer type from specificType {specific_type}, club_type {club_type}, or description")
+    log.warning(f"Warning: Could not infer type from specificType {specific_type}, club_type {club_type}, or description")
     return None
 
+# Lead-in (HubSpot) modal, GTM cookie directive and geo-redirect modal
+POPUP_SELECTORS = [
+    "[id^='leadinModal-']",
+    ".leadinModal-overlay",
+    ".ec-gtm-cookie-directive",
+    ".modals-wrapper",
+    ".modals-overlay"
+]
+SUPPRESS_POPUPS = os.getenv("SCRAPER_SUPPRESS_POPUPS", "1") != "0"
+# Hosts serving the popups above; blocked whenever popup suppression is on
+POPUP_SOURCE_HOSTS = ["hsleadflows.net", "hs-scripts.com", "hscollectedforms.net", "usemessages.com", "googletagmanager.com"]
+
+REMOVE_POPUPS_JS = """
+    (selector) => {
+        document.querySelectorAll(selector).forEach(el => el.remove());
+        return !!document.querySelector(selector);
+    }
+"""
+
+POPUPS_PRESENT_JS = """
+    (selector) => !!document.querySelector(selector)
+"""
+
+# Runs before any page script: hides popups with CSS and removes them as soon as they are inserted
+POPUP_SUPPRESSION_JS = """
+(() => {
+    const selector = %s;
+    const inject = () => {
+        if (document.getElementById('scraper-popup-suppression')) return;
+        const root = document.head || document.documentElement;
+        if (!root) return;
+        const style = document.createElement('style');
+        style.id = 'scraper-popup-suppression';
+        style.textContent = selector + ' { display: none !important; visibility: hidden !important; pointer-events: none !important; }';
+        root.appendChild(style);
+    };
+    const sweep = () => {
+        inject();
+        document.querySelectorAll(selector).forEach(el => el.remove());
+    };
+    new MutationObserver(sweep).observe(document, { childList: true, subtree: true });
+    document.addEventListener('DOMContentLoaded', sweep);
+    sweep();
+})();
+""" % json.dumps(", ".join(POPUP_SELECTORS))
+
+@timed("popups")
 def remove_popups(page, process_id):
-    """Remove modal and cookie consent popups, retrying until successful."""
+    """Remove any modal and cookie consent popups that got past the init script."""
+    selector = ", ".join(POPUP_SELECTORS)
     max_attempts = 3
     for attempt in range(max_attempts):
         try:
-            page.evaluate("""
-                let modal = document.querySelector('#leadinModal-4501297');
-                if (modal) modal.remove();
-                let overlay = document.querySelector('.leadinModal-overlay');
-                if (overlay) overlay.remove();
-                let cookiePopup = document.querySelector('.ec-gtm-cookie-directive');
-                if (cookiePopup) cookiePopup.remove();
-                let geoModal = document.querySelector('.modals-wrapper');
-                if (geoModal) geoModal.remove();
-                let geoOverlay = document.querySelector('.modals-overlay');
-                if (geoOverlay) geoOverlay.remove();
-            """)
-            print(f"Process {process_id} - Attempt {attempt + 1}: Removed popups using JavaScript")
-            page.wait_for_function("""
-                () => {
-                    return !document.querySelector('#leadinModal-4501297') &&
-                           !document.querySelector('.leadinModal-overlay') &&
-                           !document.query_selector('.ec-gtm-cookie-directive') &&
-                           !document.query_selector('.modals-wrapper') &&
-                           !document.query_selector('.modals-overlay');
-                }
-            """, timeout=3000)
-            print(f"Process {process_id} - Confirmed all popups removed")
-            page.wait_for_timeout(500)
-            return True
+            if not page.evaluate(REMOVE_POPUPS_JS, selector):
+                return True
+            log.warning(f"Attempt {attempt + 1}: Popups still present after removal")
         except Exception as e:
-            print(f"Process {process_id} - Attempt {attempt + 1}: Error removing popups: {e}")
-            if attempt == max_attempts - 1:
-                print(f"Process {process_id} - Failed to remove popups after {max_attempts} attempts")
-                return False
-            page.wait_for_timeout(500)
+            log.error(f"Attempt {attempt + 1}: Error removing popups: {e}")
+        if attempt == max_attempts - 1:
+            log.warning(f"Failed to remove popups after {max_attempts} attempts")
+            return False
+        page.wait_for_timeout(500)
 
 def ensure_no_popups(page, process_id):
     """Ensure no popups are present before interacting with the page."""
+    if SUPPRESS_POPUPS:
+        # The init script removes popups as they are inserted, so there is nothing to check
+        return True
     try:
-        popup_present = page.evaluate("""
-            () => {
-                return !!document.querySelector('#leadinModal-4501297') ||
-                       !!document.querySelector('.leadinModal-overlay') ||
-                       !!document.querySelector('.ec-gtm-cookie-directive') ||
-                       !!document.querySelector('.modals-wrapper') ||
-                       !!document.querySelector('.modals-overlay');
-            }
-        """)
+        popup_present = page.evaluate(POPUPS_PRESENT_JS, ", ".join(POPUP_SELECTORS))
         if popup_present:
-            print(f"Process {process_id} - Popups detected, attempting to remove them")
+            log.debug("Popups detected, attempting to remove them")
             return remove_popups(page, process_id)
         return True
     except Exception as e:
-        print(f"Process {process_id} - Error checking for popups: {e}")
+        log.error(f"Error checking for popups: {e}")
         return False
 
-def get_golfer_level(page, process_id):
-    """Extract the golfer level from the page and map it to High/Medium/Low Handicapper."""
-    try:
-        golfer_level_elem = page.query_selector("span.golfer-level strong")
-        if golfer_level_elem:
-            golfer_level = golfer_level_elem.inner_text().strip()
-            if golfer_level.lower() == "beginner":
-                return "High Handicapper"
-            elif golfer_level.lower() == "intermediate":
-                return "Medium Handicapper"
-            elif golfer_level.lower() == "advanced":
-                return "Low Handicapper"
-            else:
-                print(f"Process {process_id} - Unknown golfer level: {golfer_level}, defaulting to Medium Handicapper")
-                return "Medium Handicapper"
-        else:
-            print(f"Process {process_id} - Golfer level not found, defaulting to Medium Handicapper")
-            return "Medium Handicapper"
-    except Exception as e:
-        print(f"Process {process_id} - Error extracting golfer level: {e}, defaulting to Medium Handicapper")
+def handicapper_level_from_golfer_level(golfer_level, process_id):
+    """Map the page's golfer level text to High/Medium/Low Handicapper."""
+    if not golfer_level:
+        log.warning("Golfer level not found, defaulting to Medium Handicapper")
+        return "Medium Handicapper"
+    golfer_level = golfer_level.strip()
+    if golfer_level.lower() == "beginner":
+        return "High Handicapper"
+    elif golfer_level.lower() == "intermediate":
+        return "Medium Handicapper"
+    elif golfer_level.lower() == "advanced":
+        return "Low Handicapper"
+    else:
+        log.warning(f"Unknown golfer level: {golfer_level}, defaulting to Medium Handicapper")
         return "Medium Handicapper"
 
 def get_category(club_type, handicapper_level):
@@ -243,601 +1184,1535 @@ def get_category(club_type, handicapper_level):
             return "Game Improvement Club Set"
     return "Unknown Category"
 
-def check_club_exists(conn, club_data, process_id):
-    """Check if a club already exists in the database based on unique fields."""
+STAGING_TABLES_SQL = """
+CREATE TEMP TABLE IF NOT EXISTS club_stage (
+    ord INTEGER,
+    brand TEXT,
+    model TEXT,
+    type TEXT,
+    subtype TEXT,
+    specifictype TEXT,
+    handicapperlevel TEXT,
+    category TEXT,
+    image TEXT
+) ON COMMIT DELETE ROWS;
+CREATE TEMP TABLE IF NOT EXISTS variant_stage (
+    ord INTEGER,
+    fingerprint CHAR(32),
+    club_id INTEGER,
+    price NUMERIC(10, 2),
+    loft TEXT,
+    shaftmaterial TEXT,
+    setmakeup TEXT,
+    length TEXT,
+    bounce TEXT,
+    description TEXT,
+    source TEXT,
+    url TEXT
+) ON COMMIT DELETE ROWS;
+"""
+
+# Club natural key; must match the unique index created by migrate_natural_keys.cjs
+CLUB_KEY_SQL = "brand, model, type, (COALESCE(subtype, '')), (COALESCE(specifictype, '')), (COALESCE(handicapperlevel, '')), (COALESCE(category, ''))"
+
+CLUB_MATCH_SQL = """
+    c.brand = s.brand
+    AND c.model = s.model
+    AND c.type = s.type
+    AND COALESCE(c.subtype, '') = COALESCE(s.subtype, '')
+    AND COALESCE(c.specifictype, '') = COALESCE(s.specifictype, '')
+    AND COALESCE(c.handicapperlevel, '') = COALESCE(s.handicapperlevel, '')
+    AND COALESCE(c.category, '') = COALESCE(s.category, '')
+"""
+
+# The trailing "Details: ..." lines depend on which source answered (clicked panel, row
+# markup or captured JSON), so they are kept in the description but left out of the fingerprint
+DESCRIPTION_DETAILS_PATTERN = re.compile(r", Details: .*$", re.DOTALL)
+
+def variant_fingerprint(club_id, variant_data):
+    """Return the md5 fingerprint identifying a variant of a club.
+
+    Must stay in sync with the SQL backfill in migrate_variant_fingerprint.cjs.
+    """
+    price = Decimal(str(variant_data["price"])).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    fields = [
+        str(club_id),
+        str(price),
+        variant_data["loft"] or "",
+        DESCRIPTION_DETAILS_PATTERN.sub("", variant_data["description"] or ""),
+        (variant_data["prices"][0]["retailer"] if variant_data["prices"] else None) or "",
+        (variant_data["prices"][0]["url"] if variant_data["prices"] else None) or ""
+    ]
+    return hashlib.md5("\x1f".join(fields).encode("utf-8")).hexdigest()
+
+def merge_clubs(cur, clubs):
+    """Stage club rows and upsert them on the natural key; return ({ord: club_id}, new club count)."""
+    execute_values(cur, """
+        INSERT INTO club_stage (ord, brand, model, type, subtype, specifictype, handicapperlevel, category, image)
+        VALUES %s
+    """, [
+        (idx, c["brand"], c["model"], c["type"], c["subType"], c["specificType"],
+         c["handicapperLevel"], c["category"], c["image"])
+        for idx, c in enumerate(clubs)
+    ], page_size=1000)
+    cur.execute(f"""
+        INSERT INTO clubs (brand, model, type, subtype, specifictype, handicapperlevel, category, image, created_at)
+        SELECT s.brand, s.model, s.type, s.subtype, s.specifictype, s.handicapperlevel, s.category, s.image, CURRENT_TIMESTAMP
+        FROM club_stage s
+        ORDER BY s.ord
+        ON CONFLICT ({CLUB_KEY_SQL}) DO NOTHING
+        RETURNING id
+    """)
+    new_clubs = cur.rowcount
+    cur.execute(f"""
+        SELECT s.ord, c.id
+        FROM club_stage s
+        JOIN clubs c ON {CLUB_MATCH_SQL}
+    """)
+    return {row["ord"]: row["id"] for row in cur.fetchall()}, new_clubs
+
+def merge_variants(cur, variant_rows):
+    """Stage (club_id, variant) rows and upsert them on their fingerprint; return ({ord: variant_id}, new variant count)."""
+    execute_values(cur, """
+        INSERT INTO variant_stage (ord, fingerprint, club_id, price, loft, shaftmaterial, setmakeup, length, bounce, description, source, url)
+        VALUES %s
+    """, [
+        (idx, variant_fingerprint(club_id, v), club_id, v["price"], v["loft"], v["shaftMaterial"], v["setMakeup"], v["length"], v["bounce"],
+         v["description"],
+         v["prices"][0]["retailer"] if v["prices"] else None,
+         v["prices"][0]["url"] if v["prices"] else None)
+        for idx, (club_id, v) in enumerate(variant_rows)
+    ], page_size=1000)
+    cur.execute("""
+        INSERT INTO variants (fingerprint, club_id, price, loft, shaftmaterial, setmakeup, length, bounce, description, source, url, created_at)
+        SELECT s.fingerprint, s.club_id, s.price, s.loft, s.shaftmaterial, s.setmakeup, s.length, s.bounce, s.description, s.source, s.url, CURRENT_TIMESTAMP
+        FROM variant_stage s
+        ORDER BY s.ord
+        ON CONFLICT (fingerprint) DO NOTHING
+        RETURNING id
+    """)
+    new_variants = cur.rowcount
+    cur.execute("""
+        SELECT s.ord, v.id
+        FROM variant_stage s
+        JOIN variants v ON v.fingerprint = s.fingerprint
+    """)
+    return {row["ord"]: row["id"] for row in cur.fetchall()}, new_variants
+
+def club_cache_key(brand, model, club_type, subtype, specific_type, handicapper_level, category):
+    """Normalize a club's natural key the same way as CLUB_KEY_SQL."""
+    return (brand, model, club_type, subtype or "", specific_type or "", handicapper_level or "", category or "")
+
+def club_data_cache_key(club_data):
+    """Return the cache key for a club_data dict."""
+    return club_cache_key(club_data["brand"], club_data["model"], club_data["type"], club_data["subType"],
+                          club_data["specificType"], club_data["handicapperLevel"], club_data["category"])
+
+def club_cache_put(key, club_id):
+    """Remember a club id, evicting the least recently used entry when full."""
+    with _club_cache_lock:
+        _club_cache[key] = club_id
+        _club_cache.move_to_end(key)
+        while len(_club_cache) > CLUB_CACHE_MAX_ENTRIES:
+            _club_cache.popitem(last=False)
+            club_cache_stats["evictions"] += 1
+
+def club_cache_get(key):
+    """Return a cached club id or None, counting the hit or miss."""
+    with _club_cache_lock:
+        club_id = _club_cache.get(key)
+        if club_id is None:
+            club_cache_stats["misses"] += 1
+            return None
+        _club_cache.move_to_end(key)
+        club_cache_stats["hits"] += 1
+        return club_id
+
+def club_cache_discard(keys):
+    """Drop keys whose cached ids may be stale."""
+    with _club_cache_lock:
+        for key in keys:
+            _club_cache.pop(key, None)
+
+def warm_club_cache(conn, process_id):
+    """Load the most recent clubs into this worker's cache once per process."""
+    global _club_cache_warmed
+    if _club_cache_warmed:
+        return
+    _club_cache_warmed = True
     try:
         cur = conn.cursor()
-        query = """
-        SELECT id FROM clubs
-        WHERE brand = %s
-        AND model = %s
-        AND type = %s
-        AND COALESCE(subtype, '') = COALESCE(%s, '')
-        AND COALESCE(specifictype, '') = COALESCE(%s, '')
-        AND handicapperlevel = %s
-        AND category = %s
-        """
-        params = (
-            club_data["brand"],
-            club_data["model"],
-            club_data["type"],
-            club_data["subType"],
-            club_data["specificType"],
-            club_data["handicapperLevel"],
-            club_data["category"]
-        )
-        cur.execute(query, params)
-        result = cur.fetchone()
+        cur.execute("""
+            SELECT id, brand, model, type, subtype, specifictype, handicapperlevel, category
+            FROM clubs
+            ORDER BY id DESC
+            LIMIT %s
+        """, (CLUB_CACHE_MAX_ENTRIES,))
+        rows = cur.fetchall()
         cur.close()
-        if result:
-            print(f"Process {process_id} - Club already exists: {club_data['brand']} {club_data['model']}, ID: {result['id']}")
-            return result["id"]
-        return None
+        conn.rollback()
     except Exception as e:
-        print(f"Process {process_id} - Error checking club existence: {e}")
-        return None
+        log.error(f"Error warming club cache: {e}")
+        if not conn.closed:
+            conn.rollback()
+        return
+    for row in reversed(rows):
+        club_cache_put(club_cache_key(row["brand"], row["model"], row["type"], row["subtype"],
+                                      row["specifictype"], row["handicapperlevel"], row["category"]), row["id"])
+    club_cache_stats["warmed"] = len(rows)
+    log.info(f"Warmed club cache with {len(rows)} clubs")
+
+def report_club_cache_stats(stats_by_worker):
+    """Print how many club lookups were served from the workers' caches."""
+    hits = sum(s["club_cache"]["hits"] for s in stats_by_worker.values())
+    misses = sum(s["club_cache"]["misses"] for s in stats_by_worker.values())
+    evictions = sum(s["club_cache"]["evictions"] for s in stats_by_worker.values())
+    if not hits + misses:
+        return
+    print(f"Club cache: {hits} hits, {misses} misses ({hits / (hits + misses) * 100:.1f}% hit rate), {evictions} evictions")
+
+def write_variant_groups(conn, groups, process_id):
+    """Upsert a batch of (club_data, variants) groups in one transaction.
 
-def insert_club(conn, club_data, process_id):
-    """Insert a new club into the database and return its ID."""
+    Returns the variants with their "id" and "club_id" filled in, in input order;
+    raises if the write fails.
+    """
+    groups = [(club_data, variants) for club_data, variants in groups if variants]
+    if not groups:
+        return []
+    warm_club_cache(conn, process_id)
+    cache_keys = [club_data_cache_key(club_data) for club_data, _ in groups]
+    club_ids = {}
+    uncached = []
+    for idx, key in enumerate(cache_keys):
+        club_id = club_cache_get(key)
+        if club_id:
+            club_ids[idx] = club_id
+        else:
+            uncached.append(idx)
+    new_clubs = 0
     try:
         cur = conn.cursor()
-        query = """
-        INSERT INTO clubs (brand, model, type, subtype, specifictype, handicapperlevel, category, image, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-        RETURNING id
-        """
-        params = (
-            club_data["brand"],
-            club_data["model"],
-            club_data["type"],
-            club_data["subType"],
-            club_data["specificType"],
-            club_data["handicapperLevel"],
-            club_data["category"],
-            club_data["image"]
-        )
-        cur.execute(query, params)
-        club_id = cur.fetchone()['id']
+        cur.execute(STAGING_TABLES_SQL)
+        if uncached:
+            merged_ids, new_clubs = merge_clubs(cur, [groups[idx][0] for idx in uncached])
+            for stage_idx, club_id in merged_ids.items():
+                club_ids[uncached[stage_idx]] = club_id
+        
+        variant_rows = []
+        for idx, (club_data, variants) in enumerate(groups):
+            club_id = club_ids.get(idx)
+            if not club_id:
+                log.warning(f"Failed to insert or retrieve club ID for {club_data['brand']} {club_data['model']}")
+                continue
+            variant_rows.extend((club_id, variant) for variant in variants)
+        
+        variant_ids, new_variants = merge_variants(cur, variant_rows) if variant_rows else ({}, 0)
         conn.commit()
+        count_event("db_round_trips")
         cur.close()
-        print(f"Process {process_id} - Inserted club: {club_data['brand']} {club_data['model']}, ID: {club_id}")
-        return club_id
     except Exception as e:
-        print(f"Process {process_id} - Error inserting club: {e}")
+        log.error(f"Error writing variant batch: {e}")
+        if not conn.closed:
+            conn.rollback()
+        club_cache_discard(cache_keys)
+        # Let the item fail so it is journaled as failed and its page version is not stored
+        raise
+    
+    for idx in uncached:
+        if idx in club_ids:
+            club_cache_put(cache_keys[idx], club_ids[idx])
+    
+    log.debug(f"Stored {len(groups)} clubs ({new_clubs} new) and {len(variant_rows)} variants ({new_variants} new)")
+    return [
+        {**variant, "id": variant_ids[idx], "club_id": club_id}
+        for idx, (club_id, variant) in enumerate(variant_rows)
+        if idx in variant_ids
+    ]
+
+def get_image_key(brand, model):
+    """Build the image key used for a club's image filename."""
+    return f"{brand.lower().replace(' ', '_')}_{model.lower().replace(' ', '_')}"
+
+def get_retailer(url):
+    """Return the retailer name for a product URL."""
+    return "golfbidder" if "golfbidder.co.uk" in url else "othergolfshop"
+
+def get_image_selector(url):
+    """Return the product image selector for the site a URL belongs to."""
+    if "golfbidder.co.uk" in url:
+        return ".cell.large-shrink.show-for-large img"
+    elif "othergolfshop.com" in url:
+        return ".product-image img"
+    return None
+
+def save_page_image(url, image_url, brand, model, process_id):
+    """Download the product image and return its image key, or None on failure."""
+    if not get_image_selector(url):
+        log.warning(f"Unsupported website for image scraping: {url}")
+        return None
+    if not image_url:
+        log.warning(f"No image URL found for {brand} {model}")
         return None
+    image_filename = get_image_key(brand, model)
+    if not queue_image_download(image_filename, image_url):
+        log.warning(f"Failed to save image for {brand} {model}")
+        return None
+    log.debug(f"Image reference for {brand} {model}: {image_filename}")
+    return image_filename
 
-def check_variant_exists(conn, club_id, variant_data, process_id):
-    """Check if a variant already exists in the database based on unique fields."""
-    try:
-        cur = conn.cursor()
-        query = """
-        SELECT id FROM variants
-        WHERE club_id = %s
-        AND price = %s
-        AND COALESCE(loft, '') = COALESCE(%s, '')
-        AND description = %s
-        AND COALESCE(source, '') = COALESCE(%s, '')
-        AND COALESCE(url, '') = COALESCE(%s, '')
-        """
-        retailer = variant_data["prices"][0]["retailer"] if variant_data["prices"] else None
-        url = variant_data["prices"][0]["url"] if variant_data["prices"] else None
-        params = (
-            club_id,
-            variant_data["price"],
-            variant_data["loft"],
-            variant_data["description"],
-            retailer,
-            url
-        )
-        cur.execute(query, params)
-        result = cur.fetchone()
-        cur.close()
-        if result:
-            print(f"Process {process_id} - Variant already exists for club_id {club_id}, ID: {result['id']}")
-            return result["id"]
+def parse_product_title(title, name):
+    """Split the product title into brand and model, falling back to the list name."""
+    title = title or name
+    brand = title.split(" ")[0] if title else "Unknown"
+    model = title.replace(brand, "").strip()
+    return brand, model
+
+def build_club_data(club_type, specific_type, brand, model, handicapper_level, category, image_filename):
+    """Build the club row shared by every variant in a group."""
+    return {
+        "type": club_type,
+        "subType": "Individual" if club_type != "Iron Set" else "Set",
+        "specificType": specific_type,
+        "brand": brand,
+        "model": model,
+        "handicapperLevel": handicapper_level,
+        "category": category,
+        "image": image_filename if image_filename else get_image_key(brand, model)
+    }
+
+def parse_variant_cells(cell_texts, header_labels):
+    """Map a variant row's cell texts onto the table's named columns."""
+    fields = {
+        "handedness": cell_texts[0] if cell_texts else None,
+        "condition": cell_texts[len(header_labels)] if len(cell_texts) > len(header_labels) else None,
+        "flex": None,
+        "table_loft": None,
+        "shaft_material": None,
+        "set_makeup": None,
+        "length": None,
+        "bounce": None,
+        "specific_type": None
+    }
+    for i, label in enumerate(header_labels[1:], 1):
+        value = cell_texts[i] if i < len(cell_texts) else None
+        label_lower = label.lower()
+        if "flex" in label_lower:
+            fields["flex"] = value
+        elif "loft" in label_lower:
+            fields["table_loft"] = value
+            fields["specific_type"] = value
+        elif "shaft material" in label_lower:
+            fields["shaft_material"] = value
+        elif "set makeup" in label_lower:
+            fields["set_makeup"] = value
+        elif "length" in label_lower:
+            fields["length"] = value
+        elif "bounce" in label_lower:
+            bounce = value
+            if bounce and "°" in bounce:
+                bounce = bounce.replace("°", " degrees")
+            fields["bounce"] = bounce
+    return fields
+
+def normalize_loft(details, table_loft, club_type, process_id, variant_idx):
+    """Pick the loft from the variant sub-details, falling back to the table value."""
+    numerical_loft = None
+    for detail in details:
+        if "loft" in detail.lower():
+            loft_match = re.search(r"loft\s*[:\s]\s*(\d+\.?\d*)°?", detail, re.IGNORECASE)
+            if loft_match:
+                numerical_loft = f"{float(loft_match.group(1))} degrees"
+                log.debug(f"Extracted numerical loft from sub-details: {numerical_loft}")
+                break
+    
+    if not numerical_loft:
+        numerical_loft = table_loft
+        log.debug(f"Using table loft as fallback: {numerical_loft}")
+    
+    if numerical_loft:
+        numerical_loft = numerical_loft.replace("Driver - ", "")
+        loft_match = re.search(r"(\d+\.?\d*)°?", numerical_loft)
+        if loft_match:
+            numerical_loft = f"{float(loft_match.group(1))} degrees"
+            log.debug(f"Normalized numerical loft: {numerical_loft}")
+        else:
+            log.debug(f"Could not normalize loft from table value: {numerical_loft}")
+            numerical_loft = None
+    
+    if club_type.lower() == "putter" and not numerical_loft:
+        log.debug(f"No loft available for putter variant {variant_idx}, proceeding without loft")
+    return numerical_loft
+
+def build_variant_entry(cell_texts, header_labels, price_raw, details, club_type, brand, model,
+                        handicapper_level, category, image_filename, url, process_id, variant_idx):
+    """Normalize one scraped variant row; return (group_key, variant_entry) or None to skip it."""
+    fields = parse_variant_cells(cell_texts, header_labels)
+    handedness = fields["handedness"]
+    condition = fields["condition"]
+    specific_type = fields["specific_type"]
+    price_value = float(re.sub(r"[^\d.]", "", price_raw)) if price_raw else 0.0
+    numerical_loft = normalize_loft(details, fields["table_loft"], club_type, process_id, variant_idx)
+    
+    loft_num = None
+    if numerical_loft:
+        loft_num_match = re.search(r"(\d+\.?\d*)\s*degrees", numerical_loft)
+        if loft_num_match:
+            loft_num = float(loft_num_match.group(1))
+    
+    if loft_num:
+        if club_type == "Driver":
+            specific_type = determine_driver_specific_type(numerical_loft)
+            log.debug(f"Updated specificType for Driver: {specific_type}")
+        elif club_type == "Wedge":
+            specific_type = determine_wedge_specific_type(numerical_loft)
+            log.debug(f"Updated specificType for Wedge: {specific_type}")
+    
+    description_parts = [f"Handedness: {handedness}"]
+    if fields["flex"]:
+        description_parts.append(f"Flex: {fields['flex']}")
+    if numerical_loft:
+        description_parts.append(f"Loft: {numerical_loft}")
+    if fields["shaft_material"]:
+        description_parts.append(f"Shaft Material: {fields['shaft_material']}")
+    if fields["set_makeup"]:
+        description_parts.append(f"Set Makeup: {fields['set_makeup']}")
+    if fields["length"]:
+        description_parts.append(f"Length: {fields['length']}")
+    if fields["bounce"]:
+        description_parts.append(f"Bounce: {fields['bounce']}")
+    if condition:
+        description_parts.append(f"Condition: {condition}")
+    if details:
+        description_parts.append(f"Details: {', '.join(details)}")
+    description = ", ".join(description_parts)
+    
+    if not all([handedness, price_raw, condition]):
+        log.warning(f"Missing required elements in variant {variant_idx}: Handedness={handedness}, Condition={condition}, Price={price_raw}")
+        return None
+    
+    inferred_type = infer_type_from_specific_type(specific_type, description, club_type, process_id)
+    if not inferred_type:
+        log.warning(f"Skipping variant {variant_idx} due to unknown type")
         return None
+    
+    variant_type = inferred_type
+    if club_type != inferred_type:
+        log.debug(f"Mismatch: Variant {variant_idx} type {inferred_type} does not match parent type {club_type} for {brand} {model}, using inferred type")
+    
+    group_key = (variant_type, specific_type, brand, model)
+    variant_entry = {
+        "type": variant_type,
+        "subType": "Individual" if variant_type != "Iron Set" else "Set",
+        "specificType": specific_type,
+        "brand": brand,
+        "model": model,
+        "loft": numerical_loft,
+        "shaftMaterial": fields["shaft_material"],
+        "setMakeup": fields["set_makeup"],
+        "length": fields["length"],
+        "bounce": fields["bounce"],
+        "price": price_value,
+        "handicapperLevel": handicapper_level,
+        "category": category,
+        "description": description,
+        "prices": [{
+            "retailer": get_retailer(url),
+            "price": price_value,
+            "url": url
+        }],
+        "image": image_filename if image_filename else get_image_key(brand, model)
+    }
+    return group_key, variant_entry
+
+@timed("db_write")
+def save_out_of_stock_item(club_data, url, process_id):
+    """Store an out-of-stock product as a single zero-price variant."""
+    variant_data = {
+        "price": 0.0,
+        "loft": None,
+        "shaftMaterial": None,
+        "setMakeup": None,
+        "length": None,
+        "bounce": None,
+        "description": "Out of stock",
+        "prices": [{
+            "retailer": get_retailer(url),
+            "price": 0.0,
+            "url": url
+        }]
+    }
+    with db_connection(process_id) as conn:
+        return write_variant_groups(conn, [(club_data, [variant_data])], process_id)
+
+@timed("db_write")
+def save_variant_groups(variant_groups, handicapper_level, category, image_filename, process_id):
+    """Store every grouped variant of a product page and return them with their IDs."""
+    groups = []
+    for group_key, variants in variant_groups.items():
+        inferred_type, specific_type, group_brand, group_model = group_key
+        club_data = build_club_data(inferred_type, specific_type, group_brand, group_model,
+                                    handicapper_level, category, image_filename)
+        groups.append((club_data, variants))
+    with db_connection(process_id) as conn:
+        return write_variant_groups(conn, groups, process_id)
+
+# Resolves once a Load More click has added rows or the button has been removed; a button
+# that is merely hidden may still be waiting on its request, so that does not count
+LOAD_MORE_SETTLED_JS = """
+    (previousCount) => {
+        return document.querySelectorAll('.product-alternatives-item-new.cell').length > previousCount ||
+               !document.querySelector('.see-all-button-alternative');
+    }
+"""
+
+# Resolves once the button is visible (script may reveal it after the rows render) or gone
+LOAD_MORE_VISIBLE_JS = """
+    () => {
+        const button = document.querySelector('.see-all-button-alternative');
+        return !button || button.offsetParent !== null;
+    }
+"""
+
+# Reads the pagination state, scrolling the button into view as the old bottom-of-page scroll did
+LOAD_MORE_STATE_JS = """
+    () => {
+        const button = document.querySelector('.see-all-button-alternative');
+        if (button) button.scrollIntoView({block: 'center'});
+        return {
+            count: document.querySelectorAll('.product-alternatives-item-new.cell').length,
+            present: !!button,
+            visible: !!button && button.offsetParent !== null
+        };
+    }
+"""
+LOAD_MORE_VISIBLE_TIMEOUT_MS = int(os.getenv("SCRAPER_LOAD_MORE_VISIBLE_TIMEOUT_MS", "5000"))
+
+@timed("load_more")
+def load_all_variants(page, process_id):
+    """Click 'Load More' until every variant row is on the page; return the number of rounds."""
+    rounds = 0
+    max_load_more_rounds = 10
+    while rounds < max_load_more_rounds:
+        try:
+            if not ensure_no_popups(page, process_id):
+                log.warning("Popups still present, cannot click 'Load More'")
+                break
+            state = page.evaluate(LOAD_MORE_STATE_JS)
+            if not state["present"]:
+                break
+            if not state["visible"]:
+                try:
+                    page.wait_for_function(LOAD_MORE_VISIBLE_JS, timeout=LOAD_MORE_VISIBLE_TIMEOUT_MS)
+                except PlaywrightTimeoutError:
+                    log.debug("'Load More' never became visible")
+                    break
+                state = page.evaluate(LOAD_MORE_STATE_JS)
+                if not state["visible"]:
+                    break
+            log.debug(f"Clicking 'Load More' (round {rounds + 1})...")
+            page.evaluate("document.querySelector('.see-all-button-alternative')?.click()")
+            page.wait_for_function(LOAD_MORE_SETTLED_JS, arg=state["count"], timeout=10000)
+            rounds += 1
+            if page.evaluate(LOAD_MORE_STATE_JS)["count"] == state["count"]:
+                log.debug("No new variants loaded after clicking 'Load More'")
+                break
+        except Exception as e:
+            log.error(f"Error clicking 'Load More' on product page: {e}")
+            break
+    log.debug(f"Finished 'Load More' pagination after {rounds} rounds")
+    count_event("load_more_rounds", rounds)
+    return rounds
+
+VARIANT_DETAILS_JS = """
+    () => {
+        let list = document.querySelector('.grid-y.align-justify ul');
+        const usedFallback = !list;
+        if (!list) list = document.querySelector('.product-alternatives-details ul');
+        return {
+            usedFallback: usedFallback,
+            items: list ? Array.from(list.querySelectorAll('li'), item => item.innerText) : []
+        };
+    }
+"""
+
+def parse_variant_details(result, process_id):
+    """Clean up the sub-detail lines read by VARIANT_DETAILS_JS."""
+    if result["usedFallback"]:
+        log.debug("Sub-details not found with selector '.grid-y.align-justify ul', trying alternative selector")
+    return [item.strip() for item in result["items"] if item and item.strip()]
+
+@timed("variant_click")
+def get_variant_details(page, variant, process_id, variant_idx, variant_count):
+    """Click a variant row and return the sub-detail lines it reveals."""
+    if not ensure_no_popups(page, process_id):
+        log.warning("Popups still present, proceeding with table loft")
+        return []
+    details = []
+    try:
+        variant.click(timeout=10000)
+        page.wait_for_timeout(500)
+        details = parse_variant_details(page.evaluate(VARIANT_DETAILS_JS), process_id)
+        log.debug(f"Extracted sub-details: {details}")
     except Exception as e:
-        print(f"Process {process_id} - Error checking variant existence: {e}")
+        log.error(f"Error clicking variant {variant_idx}/{variant_count}: {e}")
+        log.debug("Using table loft as fallback")
+    return details
+
+# Page states in priority order; the first selector present decides the state
+PAGE_STATE_SELECTORS = [
+    ["in_stock", ".product-alternatives-item-new.cell"],
+    ["out_of_stock", ".product-info-stock-sku .stock.unavailable"],
+    ["not_found", "body.cms-noroute-index, body.cms-no-route"]
+]
+PAGE_STATE_TIMEOUT_MS = int(os.getenv("SCRAPER_PAGE_STATE_TIMEOUT_MS", "3000"))
+
+CLASSIFY_PAGE_JS = """
+    (states) => {
+        for (const [state, selector] of states) {
+            if (document.querySelector(selector)) return state;
+        }
+        return 'unknown';
+    }
+"""
+
+def page_state_from_response(response):
+    """Classify a page from its HTTP response alone, or return None to inspect the DOM."""
+    if response is not None and response.status == 404:
+        return "not_found"
+    return None
+
+def record_page_state(page_state, url, process_id):
+    """Count and log a product page's classified state."""
+    page_state_stats[page_state] += 1
+    log.debug(f"Page state for {url}: {page_state}")
+
+@timed("classify")
+def classify_page_state(page, response, url, process_id):
+    """Resolve as soon as the variant table, out-of-stock marker or not-found page appears."""
+    page_state = page_state_from_response(response)
+    if not page_state:
+        try:
+            page.wait_for_selector(", ".join(selector for _, selector in PAGE_STATE_SELECTORS),
+                                   state="attached", timeout=PAGE_STATE_TIMEOUT_MS)
+        except Exception as e:
+            log.warning(f"No page state marker found on {url}: {e}")
+        page_state = page.evaluate(CLASSIFY_PAGE_JS, PAGE_STATE_SELECTORS)
+    record_page_state(page_state, url, process_id)
+    return page_state
+
+@timed("classify")
+async def classify_page_state_async(page, response, url, process_id):
+    """Async counterpart of classify_page_state."""
+    page_state = page_state_from_response(response)
+    if not page_state:
+        try:
+            await page.wait_for_selector(", ".join(selector for _, selector in PAGE_STATE_SELECTORS),
+                                         state="attached", timeout=PAGE_STATE_TIMEOUT_MS)
+        except Exception as e:
+            log.warning(f"No page state marker found on {url}: {e}")
+        page_state = await page.evaluate(CLASSIFY_PAGE_JS, PAGE_STATE_SELECTORS)
+    record_page_state(page_state, url, process_id)
+    return page_state
+
+def report_page_state_stats(stats_by_worker):
+    """Print how many product pages ended in each state."""
+    totals = defaultdict(int)
+    for stats in stats_by_worker.values():
+        for page_state, count in stats.get("page_states", {}).items():
+            totals[page_state] += count
+    if totals:
+        print("Page states: " + ", ".join(f"{page_state}: {count}" for page_state, count in sorted(totals.items())))
+
+# One round trip for everything the scraper reads from a product page
+EXTRACT_PRODUCT_JS = """
+    (imageSelector) => {
+        const text = el => el ? el.innerText : null;
+        const categoryLink = document.querySelector('li.item.product_type a');
+        const image = imageSelector ? document.querySelector(imageSelector) : null;
+        return {
+            title: text(document.querySelector('.grid-y.align-justify h3')),
+            categoryTitle: categoryLink ? categoryLink.getAttribute('title') : null,
+            golferLevel: text(document.querySelector('span.golfer-level strong')),
+            imageSrc: image ? image.getAttribute('src') : null,
+            headers: Array.from(document.querySelectorAll('.product-alternatives-head-new .grid-x-medium-gutter p'), text),
+            rows: Array.from(document.querySelectorAll('.product-alternatives-item-new.cell'), row => {
+                const tagged = [row, ...row.querySelectorAll('[data-id], [data-sku], [data-product-id], [data-item-id], [data-entity-id]')];
+                const dataValues = [];
+                const dataLofts = [];
+                for (const el of tagged) {
+                    for (const [key, value] of Object.entries(el.dataset)) {
+                        dataValues.push(value);
+                        if (key.toLowerCase().includes('loft')) dataLofts.push(value);
+                    }
+                }
+                return {
+                    cells: Array.from(row.querySelectorAll('.cell.medium-auto.text-value.show-for-medium.align-self-middle'), text),
+                    price: text(row.querySelector('span.price-wrapper')),
+                    detailItems: Array.from(row.querySelectorAll('ul li'), li => li.textContent),
+                    dataValues: dataValues,
+                    dataLofts: dataLofts
+                };
+            })
+        };
+    }
+"""
+
+def collapse_whitespace(text):
+    """Collapse runs of whitespace the way static_text does, so both fetch tiers yield the same values."""
+    return " ".join(text.split()) if text is not None else None
+
+def parse_product_snapshot(snapshot, name, process_id):
+    """Turn the EXTRACT_PRODUCT_JS result into the product fields the scraper stores."""
+    brand, model = parse_product_title(collapse_whitespace(snapshot["title"]), name)
+    club_type = club_type_from_category_title(collapse_whitespace(snapshot["categoryTitle"]))
+    handicapper_level = handicapper_level_from_golfer_level(collapse_whitespace(snapshot["golferLevel"]), process_id)
+    labels = [collapse_whitespace(header or "") for header in snapshot["headers"]]
+    return {
+        "brand": brand,
+        "model": model,
+        "club_type": club_type,
+        "handicapper_level": handicapper_level,
+        "category": get_category(club_type, handicapper_level),
+        "image_src": snapshot["imageSrc"],
+        "header_labels": [label for label in labels if label not in ["Condition", "Price", "Head - Shaft - Grip"]],
+        "rows": [
+            {
+                "cells": [collapse_whitespace(cell or "") for cell in row["cells"]],
+                "price": collapse_whitespace(row["price"]),
+                "detail_items": [" ".join(item.split()) for item in row["detailItems"] if item and item.strip()],
+                "data_values": [str(value) for value in row["dataValues"]],
+                "data_lofts": [str(value).strip() for value in row["dataLofts"] if value and str(value).strip()]
+            }
+            for row in snapshot["rows"]
+        ]
+    }
+
+# "auto" reads variant sub-details from the page and its JSON responses, clicking only
+# when they carry no loft; "click" always clicks each variant row
+VARIANT_DETAILS_MODE = os.getenv("SCRAPER_VARIANT_DETAILS", "auto")
+JSON_ID_KEYS = ("id", "sku", "entity_id", "product_id", "item_id")
+LOFT_DETAIL_PATTERN = re.compile(r"loft\s*[:\s]\s*(\d+\.?\d*)", re.IGNORECASE)
+
+def index_json_details(payload, details_index):
+    """Index loft fields in a JSON payload by the id-like values of the objects holding them."""
+    stack = [payload]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            lofts = [
+                value for key, value in node.items()
+                if "loft" in str(key).lower() and isinstance(value, (str, int, float)) and str(value).strip()
+            ]
+            if lofts:
+                for key in JSON_ID_KEYS:
+                    if isinstance(node.get(key), (str, int)):
+                        details_index[str(node[key])] = [f"Loft: {str(lofts[0]).strip()}"]
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+
+def is_detail_response(response, url):
+    """Check whether a response is same-site XHR/fetch JSON worth indexing."""
+    if response.request.resource_type not in ("xhr", "fetch"):
+        return False
+    if urlparse(response.url).hostname != urlparse(url).hostname:
+        return False
+    return "json" in (response.headers.get("content-type") or "")
+
+def capture_json_details(page, url):
+    """Index variant details from the page's JSON responses as they arrive."""
+    details_index = {}
+    if VARIANT_DETAILS_MODE != "auto":
+        return details_index
+    
+    def handle_response(response):
+        if not is_detail_response(response, url):
+            return
+        try:
+            index_json_details(response.json(), details_index)
+        except Exception:
+            pass
+    
+    page.on("response", handle_response)
+    return details_index
+
+def capture_json_details_async(page, url):
+    """Async counterpart of capture_json_details."""
+    details_index = {}
+    if VARIANT_DETAILS_MODE != "auto":
+        return details_index
+    
+    async def handle_response(response):
+        if not is_detail_response(response, url):
+            return
+        try:
+            index_json_details(await response.json(), details_index)
+        except Exception:
+            pass
+    
+    page.on("response", handle_response)
+    return details_index
+
+def passive_variant_details(row, details_index):
+    """Return sub-details for a row without clicking it, or [] if none carry a loft."""
+    if VARIANT_DETAILS_MODE != "auto":
+        return []
+    candidates = [
+        row["detail_items"],
+        [f"Loft: {loft}" for loft in row["data_lofts"]],
+        next((details_index[value] for value in row["data_values"] if value in details_index), [])
+    ]
+    for details in candidates:
+        if any(LOFT_DETAIL_PATTERN.search(detail) for detail in details):
+            return details
+    return []
+
+def variant_row_is_complete(row, header_labels, process_id, variant_idx):
+    """Check that a variant row has a price and a cell for every column."""
+    if len(row["cells"]) < len(header_labels) + 1 or row["price"] is None:
+        log.debug(f"Missing elements in variant {variant_idx}: Not enough text values ({len(row['cells'])}) or missing price")
+        return False
+    return True
+
+def new_host_state():
+    """Return the starting rate-limit state for a host."""
+    return {"rate": RATE_INITIAL, "tokens": RATE_BURST, "updated": time.time(), "hold_until": 0.0,
+            "failures": 0, "requests": 0, "retries": 0, "throttled": 0, "wait_seconds": 0.0}
+
+def reserve_host_slot(host):
+    """Take a token from the host's bucket and return how long to wait before using it."""
+    with _rate_lock:
+        state = _rate_state.get(host) or new_host_state()
+        now = time.time()
+        state["tokens"] = min(RATE_BURST, state["tokens"] + (now - state["updated"]) * state["rate"]) - 1
+        state["updated"] = now
+        wait = max(0.0, -state["tokens"] / state["rate"], state["hold_until"] - now)
+        state["requests"] += 1
+        state["wait_seconds"] += wait
+        _rate_state[host] = state
+    return wait
+
+def backoff_delay(failures):
+    """Exponential backoff with jitter for the given number of consecutive failures."""
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (failures - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def record_host_result(host, latency, transient_failure, retry_after=None):
+    """Adapt the host's rate: creep up on fast successes, back off on slow or failed requests."""
+    with _rate_lock:
+        state = _rate_state.get(host) or new_host_state()
+        if transient_failure:
+            state["failures"] += 1
+            state["throttled"] += 1
+            state["rate"] = max(RATE_MIN, state["rate"] / 2)
+            state["hold_until"] = time.time() + max(backoff_delay(state["failures"]), retry_after or 0)
+        else:
+            state["failures"] = 0
+            if latency > RATE_TARGET_LATENCY:
+                state["rate"] = max(RATE_MIN, state["rate"] * 0.9)
+            else:
+                state["rate"] = min(RATE_MAX, state["rate"] + RATE_INCREASE)
+        _rate_state[host] = state
+
+def take_retry(host, attempt):
+    """Allow another attempt while under the per-item limit and the host's retry budget."""
+    if attempt >= MAX_RETRIES or stop_requested():
+        return False
+    with _rate_lock:
+        state = _rate_state.get(host) or new_host_state()
+        if state["retries"] >= RETRY_BUDGET_RATIO * state["requests"] + MAX_RETRIES:
+            return False
+        state["retries"] += 1
+        _rate_state[host] = state
+    count_event("retries")
+    return True
+
+def is_transient_error(e):
+    """Check whether an exception is a timeout or dropped connection worth retrying."""
+    if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    return "Timeout" in type(e).__name__ or "net::ERR_" in str(e)
+
+def response_status(response):
+    """Return the HTTP status of a requests or Playwright response, or None."""
+    if response is None:
         return None
+    status = getattr(response, "status_code", None)
+    return status if status is not None else getattr(response, "status", None)
 
-def insert_variant(conn, club_id, variant_data, process_id):
-    """Insert a new variant into the database and return its ID."""
+def retry_after_seconds(response):
+    """Parse a numeric Retry-After header, if any."""
     try:
-        cur = conn.cursor()
-        query = """
-        INSERT INTO variants (club_id, price, loft, shaftmaterial, setmakeup, length, bounce, description, source, url, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
-        RETURNING id
-        """
-        retailer = variant_data["prices"][0]["retailer"] if variant_data["prices"] else None
-        url = variant_data["prices"][0]["url"] if variant_data["prices"] else None
-        params = (
-            club_id,
-            variant_data["price"],
-            variant_data["loft"],
-            variant_data["shaftMaterial"],
-            variant_data["setMakeup"],
-            variant_data["length"],
-            variant_data["bounce"],
-            variant_data["description"],
-            retailer,
-            url
-        )
-        cur.execute(query, params)
-        variant_id = cur.fetchone()['id']
-        conn.commit()
-        cur.close()
-        print(f"Process {process_id} - Inserted variant for club_id {club_id}, ID: {variant_id}")
-        return variant_id
+        return float(response.headers.get("retry-after") or response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+def transient_response(host, response, latency):
+    """Feed a response back to the limiter and report whether it is a transient failure."""
+    if response_status(response) in TRANSIENT_STATUSES:
+        record_host_result(host, latency, True, retry_after_seconds(response))
+        return True
+    record_host_result(host, latency, False)
+    return False
+
+def fetch_with_retries(url, process_id, fetch, stage):
+    """Call fetch() under the host's rate limit, retrying timeouts, 429s and 5xx with backoff."""
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        wait = reserve_host_slot(host)
+        record_stage("rate_limit_wait", wait)
+        time.sleep(wait)
+        started = time.monotonic()
+        try:
+            with timed_stage(stage):
+                response = fetch()
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            count_event("timeouts" if "Timeout" in type(e).__name__ else "connection_errors")
+            record_host_result(host, time.monotonic() - started, True)
+            if not take_retry(host, attempt):
+                raise
+            attempt += 1
+            log.warning(f"Retrying {url} (attempt {attempt + 1}) after: {e}")
+            continue
+        if not transient_response(host, response, time.monotonic() - started) or not take_retry(host, attempt):
+            return response
+        attempt += 1
+        log.warning(f"Retrying {url} (attempt {attempt + 1}) after HTTP {response_status(response)}")
+
+async def fetch_with_retries_async(url, process_id, fetch, stage):
+    """Async counterpart of fetch_with_retries; fetch is a coroutine function."""
+    host = urlparse(url).netloc
+    attempt = 0
+    while True:
+        wait = await asyncio.to_thread(reserve_host_slot, host)
+        record_stage("rate_limit_wait", wait)
+        await asyncio.sleep(wait)
+        started = time.monotonic()
+        try:
+            with timed_stage(stage):
+                response = await fetch()
+        except Exception as e:
+            if not is_transient_error(e):
+                raise
+            count_event("timeouts" if "Timeout" in type(e).__name__ else "connection_errors")
+            # The limiter state lives in the Manager process, so its round trips stay off the event loop
+            await asyncio.to_thread(record_host_result, host, time.monotonic() - started, True)
+            if not await asyncio.to_thread(take_retry, host, attempt):
+                raise
+            attempt += 1
+            log.warning(f"Retrying {url} (attempt {attempt + 1}) after: {e}")
+            continue
+        latency = time.monotonic() - started
+        if response_status(response) not in TRANSIENT_STATUSES:
+            await asyncio.to_thread(record_host_result, host, latency, False)
+            return response
+        await asyncio.to_thread(record_host_result, host, latency, True, retry_after_seconds(response))
+        if not await asyncio.to_thread(take_retry, host, attempt):
+            return response
+        attempt += 1
+        log.warning(f"Retrying {url} (attempt {attempt + 1}) after HTTP {response_status(response)}")
+
+def report_rate_limits(rate_state):
+    """Print each host's final rate, waits, throttling events and retries."""
+    for host, state in sorted(dict(rate_state).items()):
+        print(f"Rate limit {host}: {state['rate']:.2f} req/s at end, {state['requests']} requests, "
+              f"{state['wait_seconds']:.0f}s waiting, {state['throttled']} throttled, {state['retries']} retries")
+
+# Static fast path: most product pages render the variant table server-side, so a
+# pooled GET is tried first and a browser page is only used when the HTML is incomplete
+STATIC_FETCH = os.getenv("SCRAPER_STATIC_FETCH", "1") != "0"
+STATIC_FETCH_TIMEOUT = float(os.getenv("SCRAPER_STATIC_FETCH_TIMEOUT", "10"))
+STATIC_DATA_SELECTOR = "[data-id], [data-sku], [data-product-id], [data-item-id], [data-entity-id]"
+_http_local = threading.local()
+
+def get_http_session():
+    """Return this thread's pooled HTTP session, sending the same headers as the browser."""
+    session = getattr(_http_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"User-Agent": CONTEXT_OPTIONS["user_agent"], **CONTEXT_OPTIONS["extra_http_headers"]})
+        _http_local.session = session
+    return session
+
+def parse_static_html(content):
+    """Parse HTML with lxml, or return None if lxml or cssselect is not installed."""
+    try:
+        from lxml import html as lxml_html
+    except ImportError:
+        return None
+    if importlib.util.find_spec("cssselect") is None:
+        return None
+    return lxml_html.fromstring(content)
+
+def static_text(el):
+    """Approximate innerText for an lxml element."""
+    return " ".join(el.text_content().split()) if el is not None else None
+
+def static_first(root, selector):
+    """Return the first element matching a CSS selector, or None."""
+    found = root.cssselect(selector)
+    return found[0] if found else None
+
+@timed("extract")
+def extract_product_static(document, image_selector):
+    """Build the same snapshot EXTRACT_PRODUCT_JS returns from server-rendered HTML."""
+    category_link = static_first(document, "li.item.product_type a")
+    image = static_first(document, image_selector) if image_selector else None
+    rows = []
+    for row in document.cssselect(".product-alternatives-item-new.cell"):
+        data_values = []
+        data_lofts = []
+        for el in [row] + row.cssselect(STATIC_DATA_SELECTOR):
+            for key, value in el.attrib.items():
+                if key.startswith("data-"):
+                    data_values.append(value)
+                    if "loft" in key.lower():
+                        data_lofts.append(value)
+        rows.append({
+            "cells": [static_text(cell) for cell in row.cssselect(".cell.medium-auto.text-value.show-for-medium.align-self-middle")],
+            "price": static_text(static_first(row, "span.price-wrapper")),
+            "detailItems": [li.text_content() for li in row.cssselect("ul li")],
+            "dataValues": data_values,
+            "dataLofts": data_lofts
+        })
+    return {
+        "title": static_text(static_first(document, ".grid-y.align-justify h3")),
+        "categoryTitle": category_link.get("title") if category_link is not None else None,
+        "golferLevel": static_text(static_first(document, "span.golfer-level strong")),
+        "imageSrc": image.get("src") if image is not None else None,
+        "headers": [static_text(header) for header in document.cssselect(".product-alternatives-head-new .grid-x-medium-gutter p")],
+        "rows": rows
+    }
+
+def static_page_state(response, document):
+    """Classify server-rendered HTML the same way CLASSIFY_PAGE_JS classifies the DOM."""
+    if response.status_code == 404:
+        return "not_found"
+    for page_state, selector in PAGE_STATE_SELECTORS:
+        if document.cssselect(selector):
+            return page_state
+    return "unknown"
+
+def static_load_more_present(document):
+    """Check for a 'Load More' button in the markup, even a hidden one, since script may reveal it."""
+    return bool(document.cssselect(".see-all-button-alternative"))
+
+def static_product_incomplete(document, product):
+    """Return why the static HTML cannot stand in for a browser page, or None if it can."""
+    if static_load_more_present(document):
+        return "'Load More' present"
+    if not product["rows"]:
+        return "no variant rows"
+    if VARIANT_DETAILS_MODE != "auto":
+        return "variant details set to click"
+    header_labels = product["header_labels"]
+    for row in product["rows"]:
+        if len(row["cells"]) >= len(header_labels) + 1 and row["price"] is not None and not passive_variant_details(row, {}):
+            return "variant sub-details missing"
+    return None
+
+def conditional_headers(previous):
+    """Build If-None-Match/If-Modified-Since headers from a URL's stored validators."""
+    headers = {}
+    if previous.get("etag"):
+        headers["If-None-Match"] = previous["etag"]
+    if previous.get("last_modified"):
+        headers["If-Modified-Since"] = previous["last_modified"]
+    return headers
+
+def static_content_hash(snapshot, page_state, document):
+    """Hash the product fields and variant rows of a static page, plus its 'Load More' label."""
+    load_more = static_text(static_first(document, ".see-all-button-alternative"))
+    payload = json.dumps([page_state, snapshot, load_more], sort_keys=True)
+    return hashlib.md5(payload.encode("utf-8")).hexdigest()
+
+def mark_unchanged(url, process_id, reason):
+    """Record that a page has not moved since the last run, so it is skipped."""
+    _item_versions[url]["unchanged"] = True
+    record_page_state("unchanged", url, process_id)
+    log.info(f"Skipping unchanged page {url} ({reason})")
+    return []
+
+def record_fetch_tier(tier):
+    """Count which tier served a product page."""
+    fetch_tier_stats[tier] += 1
+
+def report_fetch_tier_stats(stats_by_worker):
+    """Print the share of product pages served by each fetch tier."""
+    totals = defaultdict(int)
+    for stats in stats_by_worker.values():
+        for tier, count in stats.get("fetch_tiers", {}).items():
+            totals[tier] += count
+    total = sum(totals.values())
+    if total:
+        print("Fetch tiers: " + ", ".join(f"{tier}: {count} ({count / total:.1%})" for tier, count in sorted(totals.items())))
+
+@timed("static_total")
+def scrape_static(name, url, process_id):
+    """Scrape a product page from its static HTML; return None when the browser is needed."""
+    if not STATIC_FETCH:
+        return None
+    previous = _page_versions.get(url, {})
+    try:
+        response = fetch_with_retries(url, process_id, lambda: get_http_session().get(
+            mirror_url(url), headers=conditional_headers(previous), timeout=STATIC_FETCH_TIMEOUT
+        ), "static_fetch")
+        if response.status_code == 304:
+            _item_versions[url] = {
+                "etag": response.headers.get("ETag") or previous.get("etag"),
+                "last_modified": response.headers.get("Last-Modified") or previous.get("last_modified"),
+                "content_hash": previous.get("content_hash")
+            }
+            return mark_unchanged(url, process_id, "304 Not Modified")
+        _item_versions[url] = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_hash": None
+        }
+        if response.status_code not in (200, 404):
+            log.warning(f"Static fetch of {url} returned {response.status_code}, using browser")
+            return None
+        document = parse_static_html(response.content)
     except Exception as e:
-        print(f"Process {process_id} - Error inserting variant: {e}")
+        log.warning(f"Static fetch of {url} failed, using browser: {e}")
+        return None
+    if document is None:
+        log.warning(f"lxml/cssselect not installed, using browser for {url}")
         return None
+    
+    page_state = static_page_state(response, document)
+    if page_state == "unknown":
+        return None
+    if page_state == "not_found":
+        record_page_state(page_state, url, process_id)
+        log.info(f"Product page not found: {url}")
+        return []
+    
+    snapshot = extract_product_static(document, get_image_selector(url))
+    if static_load_more_present(document):
+        # Later rows arrive through 'Load More', so neither the HTML's validators nor its hash cover them
+        _item_versions[url] = {}
+    else:
+        content_hash = static_content_hash(snapshot, page_state, document)
+        _item_versions[url]["content_hash"] = content_hash
+        if content_hash == previous.get("content_hash"):
+            return mark_unchanged(url, process_id, "variant section unchanged")
+    
+    product = parse_product_snapshot(snapshot, name, process_id)
+    if page_state == "in_stock":
+        reason = static_product_incomplete(document, product)
+        if reason:
+            log.info(f"Static HTML incomplete for {url} ({reason}), using browser")
+            return None
+    record_page_state(page_state, url, process_id)
+    
+    brand, model = product["brand"], product["model"]
+    club_type = product["club_type"]
+    handicapper_level = product["handicapper_level"]
+    category = product["category"]
+    image_filename = save_page_image(url, product["image_src"], brand, model, process_id)
+    
+    if page_state == "out_of_stock":
+        log.info(f"Item {name} is out of stock at {url}")
+        club_data = build_club_data(club_type, None, brand, model, handicapper_level, category, image_filename)
+        return save_out_of_stock_item(club_data, url, process_id)
+    
+    header_labels = product["header_labels"]
+    variant_count = len(product["rows"])
+    log.debug(f"Found {variant_count} variants for {brand} {model} in static HTML")
+    variant_groups = defaultdict(list)
+    for variant_idx, row in enumerate(product["rows"], 1):
+        try:
+            if not variant_row_is_complete(row, header_labels, process_id, variant_idx):
+                continue
+            result = build_variant_entry(row["cells"], header_labels, row["price"], passive_variant_details(row, {}),
+                                         club_type, brand, model, handicapper_level, category, image_filename,
+                                         url, process_id, variant_idx)
+            if result:
+                group_key, variant_entry = result
+                variant_groups[group_key].append(variant_entry)
+        except Exception as e:
+            log.error(f"Error extracting variant {variant_idx}/{variant_count}: {e}")
+    return save_variant_groups(variant_groups, handicapper_level, category, image_filename, process_id)
 
 def scrape_equipment(args):
     """Scrape details for a single equipment item and store in the database."""
-    name, url, process_id, total_items, item_index, all_variants = args
+    name, url, process_id, total_items, item_index = args
     local_variants = []
     try:
-        print(f"Process {process_id} - Scraping equipment {item_index + 1}/{total_items}: {name}")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                accept_downloads=True,
-                extra_http_headers={
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                    "Accept-Language": "en-US,en;q=0.5"
-                }
-            )
+        log.debug(f"Scraping equipment {item_index + 1}/{total_items}: {name}")
+        static_variants = scrape_static(name, url, process_id)
+        if static_variants is not None:
+            record_fetch_tier("static")
+            log.info(f"Finished scraping {name} with {len(static_variants)} variants (static HTML)")
+            return static_variants
+        record_fetch_tier("browser")
+        browser = get_worker_browser(process_id)
+        context = new_scrape_context(browser)
+        router_stats = install_request_router(context)
+        try:
             page = context.new_page()
+            details_index = capture_json_details(page, url)
             
-            page.goto(url, timeout=15000)
+            response = fetch_with_retries(url, process_id, lambda: page.goto(url, timeout=15000), "goto")
+            page_state = classify_page_state(page, response, url, process_id)
             
-            try:
-                page.wait_for_selector(".product-alternatives-item-new.cell", timeout=3000)
-            except Exception as e:
-                print(f"Process {process_id} - No variants found on page {url}: {e}")
-                out_of_stock = page.query_selector(".product-info-stock-sku .stock.unavailable")
-                if out_of_stock:
-                    print(f"Process {process_id} - Item {name} is out of stock at {url}")
-                    title_element = page.query_selector(".grid-y.align-justify h3")
-                    title = title_element.inner_text() if title_element else name
-                    brand = title.split(" ")[0] if title else "Unknown"
-                    model = title.replace(brand, "").strip()
-                    club_type = determine_club_type_from_page(page)
-                    handicapper_level = get_golfer_level(page, process_id)
-                    category = get_category(club_type, handicapper_level)
-                    
-                    image_filename = None
-                    if "golfbidder.co.uk" in url:
-                        image_elem = page.query_selector(".cell.large-shrink.show-for-large img")
-                        if image_elem:
-                            image_url = image_elem.get_attribute("src")
-                            if image_url:
-                                image_filename = download_image(image_url, brand, model)
-                                if image_filename:
-                                    print(f"Process {process_id} - Image reference for {brand} {model}: {image_filename}")
-                                else:
-                                    print(f"Process {process_id} - Failed to save image for {brand} {model}")
-                            else:
-                                print(f"Process {process_id} - No image URL found for {brand} {model}")
-                        else:
-                            print(f"Process {process_id} - No image element found for {brand} {model}")
-                    elif "othergolfshop.com" in url:
-                        image_elem = page.query_selector(".product-image img")
-                        if image_elem:
-                            image_url = image_elem.get_attribute("src")
-                            if image_filename:
-                                print(f"Process {process_id} - Image already exists for {brand} {model}, using existing image")
-                            elif image_url:
-                                image_filename = download_image(image_url, brand, model)
-                                if image_filename:
-                                    print(f"Process {process_id} - Image reference for {brand} {model}: {image_filename}")
-                                else:
-                                    print(f"Process {process_id} - Failed to save image for {brand} {model}")
-                            else:
-                                print(f"Process {process_id} - No image URL found for {brand} {model}")
-                        else:
-                            print(f"Process {process_id} - No image element found for {brand} {model}")
-                    else:
-                        print(f"Process {process_id} - Unsupported website for image scraping: {url}")
-                    
-                    club_data = {
-                        "type": club_type,
-                        "subType": "Individual" if club_type != "Iron Set" else "Set",
-                        "specificType": None,
-                        "brand": brand,
-                        "model": model,
-                        "handicapperLevel": handicapper_level,
-                        "category": category,
-                        "image": image_filename if image_filename else f"{brand.lower().replace(' ', '_')}_{model.lower().replace(' ', '_')}"
-                    }
-                    
-                    conn = get_db_connection()
-                    try:
-                        club_id = check_club_exists(conn, club_data, process_id)
-                        if not club_id:
-                            club_id = insert_club(conn, club_data, process_id)
-                        if not club_id:
-                            print(f"Process {process_id} - Failed to insert or retrieve club ID for {brand} {model}")
-                            return local_variants
-
-                        variant_data = {
-                            "price": 0.0,
-                            "loft": None,
-                            "shaftMaterial": None,
-                            "setMakeup": None,
-                            "length": None,
-                            "bounce": None,
-                            "description": "Out of stock",
-                            "prices": [{
-                                "retailer": "golfbidder" if "golfbidder.co.uk" in url else "othergolfshop",
-                                "price": 0.0,
-                                "url": url
-                            }]
-                        }
-                        
-                        variant_id = check_variant_exists(conn, club_id, variant_data, process_id)
-                        if not variant_id:
-                            variant_id = insert_variant(conn, club_id, variant_data, process_id)
-                            if variant_id:
-                                local_variants.append({**variant_data, "id": variant_id, "club_id": club_id})
-                        else:
-                            local_variants.append({**variant_data, "id": variant_id, "club_id": club_id})
-                    finally:
-                        conn.close()
-                    
-                    browser.close()
-                    print(f"Process {process_id} - Finished scraping {name} with {len(local_variants)} variants (out of stock)")
-                    return local_variants
+            if page_state == "out_of_stock":
+                log.info(f"Item {name} is out of stock at {url}")
+                product = parse_product_snapshot(page.evaluate(EXTRACT_PRODUCT_JS, get_image_selector(url)), name, process_id)
+                brand, model = product["brand"], product["model"]
+                image_filename = save_page_image(url, product["image_src"], brand, model, process_id)
                 
-                page_content = page.content()
-                print(f"Process {process_id} - Page content for {url}: {page_content[:500]}...")
-                browser.close()
+                club_data = build_club_data(product["club_type"], None, brand, model, product["handicapper_level"],
+                                            product["category"], image_filename)
+                local_variants = save_out_of_stock_item(club_data, url, process_id)
+                
+                log.info(f"Finished scraping {name} with {len(local_variants)} variants (out of stock)")
                 return local_variants
             
-            remove_popups(page, process_id)
+            if page_state == "not_found":
+                log.info(f"Product page not found: {url}")
+                return local_variants
             
-            load_more_attempts = 0
-            max_load_more_attempts = 10
-            previous_variant_count = 0
-            while load_more_attempts < max_load_more_attempts:
-                try:
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(1000)
-                    
-                    if not ensure_no_popups(page, process_id):
-                        print(f"Process {process_id} - Popups still present, cannot click 'Load More'")
-                        break
-                    
-                    load_more = page.query_selector(".see-all-button-alternative")
-                    if load_more:
-                        page.wait_for_function(
-                            "element => element.offsetParent !== null",
-                            arg=load_more,
-                            timeout=5000
-                        )
-                    current_variant_count = len(page.query_selector_all(".product-alternatives-item-new.cell"))
-                    
-                    if current_variant_count == previous_variant_count and load_more_attempts > 0:
-                        print(f"Process {process_id} - No new variants loaded after clicking 'Load More'")
-                        break
-                    
-                    if load_more and load_more.is_visible():
-                        print(f"Process {process_id} - Clicking 'Load More' (attempt {load_more_attempts + 1})...")
-                        page.evaluate("document.querySelector('.see-all-button-alternative')?.click()")
-                        page.wait_for_function(
-                            f"() => document.querySelectorAll('.product-alternatives-item-new.cell').length > {current_variant_count}",
-                            timeout=10000
-                        )
-                        previous_variant_count = current_variant_count
-                        load_more_attempts += 1
-                    else:
-                        print(f"Process {process_id} - 'Load More' button not found or not visible after {load_more_attempts} attempts")
-                        break
-                except Exception as e:
-                    print(f"Process {process_id} - Error clicking 'Load More' on product page: {e}")
-                    break
+            if page_state != "in_stock":
+                log.warning(f"No variants found on page {url}")
+                _item_errors[url] = f"unrecognised page state: {page_state}"
+                if log.isEnabledFor(logging.DEBUG):
+                    page_content = page.content()
+                    log.debug(f"Page content for {url}: {page_content[:500]}...")
+                return local_variants
             
-            title_element = page.query_selector(".grid-y.align-justify h3")
-            title = title_element.inner_text() if title_element else name
-            brand = title.split(" ")[0] if title else "Unknown"
-            model = title.replace(brand, "").strip()
+            remove_popups(page, process_id)
+            load_all_variants(page, process_id)
             
-            club_type = determine_club_type_from_page(page)
-            handicapper_level = get_golfer_level(page, process_id)
-            category = get_category(club_type, handicapper_level)
-            print(f"Process {process_id} - Club type: {club_type}, Handicapper Level: {handicapper_level}, Category: {category}")
+            with timed_stage("extract"):
+                product = parse_product_snapshot(page.evaluate(EXTRACT_PRODUCT_JS, get_image_selector(url)), name, process_id)
+            brand, model = product["brand"], product["model"]
+            club_type = product["club_type"]
+            handicapper_level = product["handicapper_level"]
+            category = product["category"]
+            log.debug(f"Club type: {club_type}, Handicapper Level: {handicapper_level}, Category: {category}")
             
-            image_filename = None
-            if "golfbidder.co.uk" in url:
-                image_elem = page.query_selector(".cell.large-shrink.show-for-large img")
-                if image_elem:
-                    image_url = image_elem.get_attribute("src")
-                    if image_url:
-                        image_filename = download_image(image_url, brand, model)
-                        if image_filename:
-                            print(f"Process {process_id} - Image reference for {brand} {model}: {image_filename}")
-                        else:
-                            print(f"Process {process_id} - Failed to save image for {brand} {model}")
-                    else:
-                        print(f"Process {process_id} - No image URL found for {brand} {model}")
-                else:
-                    print(f"Process {process_id} - No image element found for {brand} {model}")
-            elif "othergolfshop.com" in url:
-                image_elem = page.query_selector(".product-image img")
-                if image_elem:
-                    image_url = image_elem.get_attribute("src")
-                    if image_filename:
-                        print(f"Process {process_id} - Image already exists for {brand} {model}, using existing image")
-                    elif image_url:
-                        image_filename = download_image(image_url, brand, model)
-                        if image_filename:
-                            print(f"Process {process_id} - Image reference for {brand} {model}: {image_filename}")
-                        else:
-                            print(f"Process {process_id} - Failed to save image for {brand} {model}")
-                    else:
-                        print(f"Process {process_id} - No image URL found for {brand} {model}")
-                else:
-                    print(f"Process {process_id} - No image element found for {brand} {model}")
-            else:
-                print(f"Process {process_id} - Unsupported website for image scraping: {url}")
+            image_filename = save_page_image(url, product["image_src"], brand, model, process_id)
             
-            headers = page.query_selector_all(".product-alternatives-head-new .grid-x-medium-gutter p")
-            header_labels = [header.inner_text().strip() for header in headers if header.inner_text().strip() not in ["Condition", "Price", "Head - Shaft - Grip"]]
-            print(f"Process {process_id} - Variant headers: {header_labels}")
+            header_labels = product["header_labels"]
+            log.debug(f"Variant headers: {header_labels}")
             
-            variants = page.query_selector_all(".product-alternatives-item-new.cell")
-            variant_count = len(variants)
-            print(f"Process {process_id} - Found {variant_count} variants for {brand} {model}")
+            rows = product["rows"]
+            variant_count = len(rows)
+            log.debug(f"Found {variant_count} variants for {brand} {model}")
             
-            if not variants:
-                print(f"Process {process_id} - No variants found. Page HTML may have changed.")
+            if not rows:
+                log.warning("No variants found. Page HTML may have changed.")
             
+            variant_locator = page.locator(".product-alternatives-item-new.cell")
             variant_groups = defaultdict(list)
+            passive_details = 0
             
-            for variant_idx, variant in enumerate(variants, 1):
+            for variant_idx, row in enumerate(rows, 1):
                 try:
-                    print(f"Process {process_id} - Processing variant {variant_idx}/{variant_count} for {brand} {model}")
-                    text_values = variant.query_selector_all(".cell.medium-auto.text-value.show-for-medium.align-self-middle")
-                    price_elem = variant.query_selector("span.price-wrapper")
-                    
-                    if len(text_values) < len(header_labels) + 1 or not price_elem:
-                        print(f"Process {process_id} - Missing elements in variant {variant_idx}: Not enough text values ({len(text_values)}) or missing price")
+                    log.debug(f"Processing variant {variant_idx}/{variant_count} for {brand} {model}")
+                    if not variant_row_is_complete(row, header_labels, process_id, variant_idx):
                         continue
                     
-                    handedness = text_values[0].inner_text().strip() if text_values[0] else None
-                    price_raw = price_elem.inner_text().strip() if price_elem else None
-                    price_value = float(re.sub(r"[^\d.]", "", price_raw)) if price_raw else 0.0
-                    condition = text_values[len(header_labels)].inner_text().strip() if text_values[len(header_labels)] else None
-                    
-                    flex = None
-                    table_loft = None
-                    shaft_material = None
-                    set_makeup = None
-                    length = None
-                    bounce = None
-                    specific_type = None
-                    
-                    for i, label in enumerate(header_labels[1:], 1):
-                        value = text_values[i].inner_text().strip() if text_values[i] else None
-                        label_lower = label.lower()
-                        if "flex" in label_lower:
-                            flex = value
-                        elif "loft" in label_lower:
-                            table_loft = value
-                            specific_type = value
-                        elif "shaft material" in label_lower:
-                            shaft_material = value
-                        elif "set makeup" in label_lower:
-                            set_makeup = value
-                        elif "length" in label_lower:
-                            length = value
-                        elif "bounce" in label_lower:
-                            bounce = value
-                            if bounce and "°" in bounce:
-                                bounce = bounce.replace("°", " degrees")
-                    
-                    if not ensure_no_popups(page, process_id):
-                        print(f"Process {process_id} - Popups still present, proceeding with table loft")
-                        numerical_loft = table_loft
-                        details = []
-                    else:
-                        max_click_attempts = 1
-                        numerical_loft = None
-                        details = []
-                        try:
-                            variant.click(timeout=10000)
-                            page.wait_for_timeout(500)
-                            sub_details = page.query_selector(".grid-y.align-justify ul")
-                            if sub_details:
-                                detail_items = sub_details.query_selector_all("li")
-                                details = [item.inner_text().strip() for item in detail_items if item.inner_text().strip()]
-                            else:
-                                print(f"Process {process_id} - Sub-details not found with selector '.grid-y.align-justify ul', trying alternative selector")
-                                sub_details = page.query_selector(".product-alternatives-details ul")
-                                if sub_details:
-                                    detail_items = sub_details.query_selector_all("li")
-                                    details = [item.inner_text().strip() for item in detail_items if item.inner_text().strip()]
-                            print(f"Process {process_id} - Extracted sub-details: {details}")
-                        except Exception as e:
-                            print(f"Process {process_id} - Error clicking variant {variant_idx}/{variant_count}: {e}")
-                            print(f"Process {process_id} - Using table loft as fallback")
-                            numerical_loft = table_loft
-                    
-                    for detail in details:
-                        if "loft" in detail.lower():
-                            loft_match = re.search(r"loft\s*[:\s]\s*(\d+\.?\d*)°?", detail, re.IGNORECASE)
-                            if loft_match:
-                                numerical_loft = f"{float(loft_match.group(1))} degrees"
-                                print(f"Process {process_id} - Extracted numerical loft from sub-details: {numerical_loft}")
-                                break
-                    
-                    if not numerical_loft:
-                        numerical_loft = table_loft
-                        print(f"Process {process_id} - Using table loft as fallback: {numerical_loft}")
-                    
-                    if numerical_loft:
-                        numerical_loft = numerical_loft.replace("Driver - ", "")
-                        loft_match = re.search(r"(\d+\.?\d*)°?", numerical_loft)
-                        if loft_match:
-                            loft_value = float(loft_match.group(1))
-                            numerical_loft = f"{loft_value} degrees"
-                            print(f"Process {process_id} - Normalized numerical loft: {numerical_loft}")
-                        else:
-                            print(f"Process {process_id} - Could not normalize loft from table value: {numerical_loft}")
-                            numerical_loft = None
-                    
-                    if club_type.lower() == "putter" and not numerical_loft:
-                        numerical_loft = None
-                        print(f"Process {process_id} - No loft available for putter variant {variant_idx}, proceeding without loft")
-                    
-                    loft_num = None
-                    if numerical_loft:
-                        loft_num_match = re.search(r"(\d+\.?\d*)\s*degrees", numerical_loft)
-                        if loft_num_match:
-                            loft_num = float(loft_num_match.group(1))
-                        else:
-                            loft_num_match = re.search(r"(\d+\.?\d*)°?", numerical_loft)
-                            if loft_num_match:
-                                loft_num = float(loft_num_match.group(1))
-                                numerical_loft = f"{loft_num} degrees"
-                                print(f"Process {process_id} - Normalized numerical loft from table value: {numerical_loft}")
-                    
-                    if loft_num:
-                        if club_type == "Driver":
-                            specific_type = None
-                            if "Adjustable Loft" in (numerical_loft or ""):
-                                specific_type = "Adjustable Launch Driver"
-                            else:
-                                if loft_num <= 9:
-                                    specific_type = "Low Launch Driver"
-                                elif 9.1 <= loft_num <= 10.5:
-                                    specific_type = "Mid Launch Driver"
-                                else:
-                                    specific_type = "High Launch Driver"
-                            print(f"Process {process_id} - Updated specificType for Driver: {specific_type}")
-                        elif club_type == "Wedge":
-                            specific_type = None
-                            if 46 <= loft_num <= 52:
-                                specific_type = "Gap Wedge"
-                            elif 53 <= loft_num <= 56:
-                                specific_type = "Sand Wedge"
-                            elif 57 <= loft_num <= 60:
-                                specific_type = "Lob Wedge"
-                            else:
-                                specific_type = "Wedge"
-                            print(f"Process {process_id} - Updated specificType for Wedge: {specific_type}")
-                    
-                    description_parts = [f"Handedness: {handedness}"]
-                    if flex:
-                        description_parts.append(f"Flex: {flex}")
-                    if numerical_loft:
-                        description_parts.append(f"Loft: {numerical_loft}")
-                    if shaft_material:
-                        description_parts.append(f"Shaft Material: {shaft_material}")
-                    if set_makeup:
-                        description_parts.append(f"Set Makeup: {set_makeup}")
-                    if length:
-                        description_parts.append(f"Length: {length}")
-                    if bounce:
-                        description_parts.append(f"Bounce: {bounce}")
-                    if condition:
-                        description_parts.append(f"Condition: {condition}")
+                    details = passive_variant_details(row, details_index)
                     if details:
-                        description_parts.append(f"Details: {', '.join(details)}")
-                    description = ", ".join(description_parts)
-                    
-                    if not all([handedness, price_raw, condition]):
-                        print(f"Process {process_id} - Missing required elements in variant {variant_idx}: Handedness={handedness}, Condition={condition}, Price={price_raw}")
-                        continue
+                        passive_details += 1
+                    else:
+                        details = get_variant_details(page, variant_locator.nth(variant_idx - 1), process_id, variant_idx, variant_count)
                     
-                    inferred_type = infer_type_from_specific_type(specific_type, description, club_type, process_id)
-                    if not inferred_type:
-                        print(f"Process {process_id} - Skipping variant {variant_idx} due to unknown type")
+                    result = build_variant_entry(row["cells"], header_labels, row["price"], details, club_type, brand, model,
+                                                 handicapper_level, category, image_filename, url, process_id, variant_idx)
+                    if not result:
                         continue
-                    
-                    variant_type = inferred_type
-                    if club_type != inferred_type:
-                        print(f"Process {process_id} - Mismatch: Variant {variant_idx} type {inferred_type} does not match parent type {club_type} for {brand} {model}, using inferred type")
-                    
-                    group_key = (variant_type, specific_type, brand, model)
-                    variant_entry = {
-                        "type": variant_type,
-                        "subType": "Individual" if variant_type != "Iron Set" else "Set",
-                        "specificType": specific_type,
-                        "brand": brand,
-                        "model": model,
-                        "loft": numerical_loft,
-                        "shaftMaterial": shaft_material,
-                        "setMakeup": set_makeup,
-                        "length": length,
-                        "bounce": bounce,
-                        "price": price_value,
-                        "handicapperLevel": handicapper_level,
-                        "category": category,
-                        "description": description,
-                        "prices": [{
-                            "retailer": "golfbidder" if "golfbidder.co.uk" in url else "othergolfshop",
-                            "price": price_value,
-                            "url": url
-                        }],
-                        "image": image_filename if image_filename else f"{brand.lower().replace(' ', '_')}_{model.lower().replace(' ', '_')}"
-                    }
+                    group_key, variant_entry = result
                     variant_groups[group_key].append(variant_entry)
-                    print(f"Process {process_id} - Grouped variant {variant_idx} under {variant_type} - {specific_type} for {brand} {model}")
+                    log.debug(f"Grouped variant {variant_idx} under {group_key[0]} - {group_key[1]} for {brand} {model}")
                 except Exception as e:
-                    print(f"Process {process_id} - Error extracting variant {variant_idx}/{variant_count}: {e}")
+                    log.error(f"Error extracting variant {variant_idx}/{variant_count}: {e}")
                     continue
             
+            log.debug(f"Read sub-details for {passive_details}/{variant_count} variants without clicking")
+            
             # Insert into database
-            conn = get_db_connection()
+            local_variants = save_variant_groups(variant_groups, handicapper_level, category, image_filename, process_id)
+            
+            log.info(f"Finished scraping {name} with {len(local_variants)} variants")
+            
+            return local_variants
+        finally:
             try:
-                for group_key, variants in variant_groups.items():
-                    inferred_type, specific_type, group_brand, group_model = group_key
-                    club_data = {
-                        "type": inferred_type,
-                        "subType": "Individual" if inferred_type != "Iron Set" else "Set",
-                        "specificType": specific_type,
-                        "brand": group_brand,
-                        "model": group_model,
-                        "handicapperLevel": handicapper_level,
-                        "category": category,
-                        "image": image_filename if image_filename else f"{group_brand.lower().replace(' ', '_')}_{group_model.lower().replace(' ', '_')}"
-                    }
-                    
-                    # Check if club exists
-                    club_id = check_club_exists(conn, club_data, process_id)
-                    if not club_id:
-                        # Insert new club
-                        club_id = insert_club(conn, club_data, process_id)
-                    if not club_id:
-                        print(f"Process {process_id} - Failed to insert or retrieve club ID for {group_brand} {group_model}")
+                context.close()
+            except Exception as e:
+                log.error(f"Error closing browser context: {e}")
+            release_worker_browser()
+            log_router_stats(router_stats, url, process_id)
+    
+    except Exception as e:
+        log.error(f"Error scraping product page {url}: {e}")
+        _item_errors[url] = str(e)
+        return local_variants
+
+def get_host_semaphore(host_semaphores, url, per_host_limit):
+    """Return the semaphore limiting concurrent pages against the URL's host."""
+    host = urlparse(url).netloc
+    if host not in host_semaphores:
+        host_semaphores[host] = asyncio.Semaphore(per_host_limit)
+    return host_semaphores[host]
+
+@timed("popups")
+async def remove_popups_async(page, process_id):
+    """Remove any modal and cookie consent popups that got past the init script."""
+    try:
+        if await page.evaluate(REMOVE_POPUPS_JS, ", ".join(POPUP_SELECTORS)):
+            log.warning("Popups still present after removal")
+            return False
+        return True
+    except Exception as e:
+        log.error(f"Error removing popups: {e}")
+        return False
+
+async def ensure_no_popups_async(page, process_id):
+    """Ensure no popups are present before interacting with the page."""
+    if SUPPRESS_POPUPS:
+        return True
+    try:
+        if await page.evaluate(POPUPS_PRESENT_JS, ", ".join(POPUP_SELECTORS)):
+            log.debug("Popups detected, attempting to remove them")
+            return await remove_popups_async(page, process_id)
+        return True
+    except Exception as e:
+        log.error(f"Error checking for popups: {e}")
+        return False
+
+@timed("load_more")
+async def load_all_variants_async(page, process_id):
+    """Click 'Load More' until every variant row is on the page; return the number of rounds."""
+    rounds = 0
+    max_load_more_rounds = 10
+    while rounds < max_load_more_rounds:
+        try:
+            if not await ensure_no_popups_async(page, process_id):
+                log.warning("Popups still present, cannot click 'Load More'")
+                break
+            state = await page.evaluate(LOAD_MORE_STATE_JS)
+            if not state["present"]:
+                break
+            if not state["visible"]:
+                try:
+                    await page.wait_for_function(LOAD_MORE_VISIBLE_JS, timeout=LOAD_MORE_VISIBLE_TIMEOUT_MS)
+                except PlaywrightTimeoutError:
+                    log.debug("'Load More' never became visible")
+                    break
+                state = await page.evaluate(LOAD_MORE_STATE_JS)
+                if not state["visible"]:
+                    break
+            log.debug(f"Clicking 'Load More' (round {rounds + 1})...")
+            await page.evaluate("document.querySelector('.see-all-button-alternative')?.click()")
+            await page.wait_for_function(LOAD_MORE_SETTLED_JS, arg=state["count"], timeout=10000)
+            rounds += 1
+            if (await page.evaluate(LOAD_MORE_STATE_JS))["count"] == state["count"]:
+                log.debug("No new variants loaded after clicking 'Load More'")
+                break
+        except Exception as e:
+            log.error(f"Error clicking 'Load More' on product page: {e}")
+            break
+    log.debug(f"Finished 'Load More' pagination after {rounds} rounds")
+    count_event("load_more_rounds", rounds)
+    return rounds
+
+@timed("variant_click")
+async def get_variant_details_async(page, variant, process_id, variant_idx, variant_count):
+    """Click a variant row and return the sub-detail lines it reveals."""
+    if not await ensure_no_popups_async(page, process_id):
+        log.warning("Popups still present, proceeding with table loft")
+        return []
+    details = []
+    try:
+        await variant.click(timeout=10000)
+        await page.wait_for_timeout(500)
+        details = parse_variant_details(await page.evaluate(VARIANT_DETAILS_JS), process_id)
+        log.debug(f"Extracted sub-details: {details}")
+    except Exception as e:
+        log.error(f"Error clicking variant {variant_idx}/{variant_count}: {e}")
+        log.debug("Using table loft as fallback")
+    return details
+
+async def scrape_equipment_async(browser, name, url, process_id, total_items, item_index):
+    """Async counterpart of scrape_equipment that shares its normalization and database writes."""
+    local_variants = []
+    try:
+        log.debug(f"Scraping equipment {item_index + 1}/{total_items}: {name}")
+        static_variants = await asyncio.to_thread(scrape_static, name, url, process_id)
+        if static_variants is not None:
+            record_fetch_tier("static")
+            log.info(f"Finished scraping {name} with {len(static_variants)} variants (static HTML)")
+            return static_variants
+        record_fetch_tier("browser")
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+        if SUPPRESS_POPUPS:
+            await context.add_init_script(POPUP_SUPPRESSION_JS)
+        router_stats = await install_request_router_async(context)
+        try:
+            page = await context.new_page()
+            details_index = capture_json_details_async(page, url)
+            response = await fetch_with_retries_async(url, process_id, lambda: page.goto(url, timeout=15000), "goto")
+            page_state = await classify_page_state_async(page, response, url, process_id)
+            
+            if page_state == "not_found":
+                log.info(f"Product page not found: {url}")
+                return local_variants
+            if page_state not in ("in_stock", "out_of_stock"):
+                log.warning(f"No variants found on page {url}")
+                _item_errors[url] = f"unrecognised page state: {page_state}"
+                if log.isEnabledFor(logging.DEBUG):
+                    page_content = await page.content()
+                    log.debug(f"Page content for {url}: {page_content[:500]}...")
+                return local_variants
+            in_stock = page_state == "in_stock"
+            if not in_stock:
+                log.info(f"Item {name} is out of stock at {url}")
+            
+            if in_stock:
+                await remove_popups_async(page, process_id)
+                await load_all_variants_async(page, process_id)
+            
+            with timed_stage("extract"):
+                product = parse_product_snapshot(await page.evaluate(EXTRACT_PRODUCT_JS, get_image_selector(url)), name, process_id)
+            brand, model = product["brand"], product["model"]
+            club_type = product["club_type"]
+            handicapper_level = product["handicapper_level"]
+            category = product["category"]
+            image_filename = await asyncio.to_thread(save_page_image, url, product["image_src"], brand, model, process_id)
+            
+            if not in_stock:
+                club_data = build_club_data(club_type, None, brand, model, handicapper_level, category, image_filename)
+                local_variants = await asyncio.to_thread(save_out_of_stock_item, club_data, url, process_id)
+                log.info(f"Finished scraping {name} with {len(local_variants)} variants (out of stock)")
+                return local_variants
+            
+            log.debug(f"Club type: {club_type}, Handicapper Level: {handicapper_level}, Category: {category}")
+            header_labels = product["header_labels"]
+            log.debug(f"Variant headers: {header_labels}")
+            
+            rows = product["rows"]
+            variant_count = len(rows)
+            log.debug(f"Found {variant_count} variants for {brand} {model}")
+            
+            variant_locator = page.locator(".product-alternatives-item-new.cell")
+            variant_groups = defaultdict(list)
+            passive_details = 0
+            for variant_idx, row in enumerate(rows, 1):
+                try:
+                    if not variant_row_is_complete(row, header_labels, process_id, variant_idx):
                         continue
                     
-                    # Insert variants
-                    for variant in variants:
-                        variant_id = check_variant_exists(conn, club_id, variant, process_id)
-                        if not variant_id:
-                            variant_id = insert_variant(conn, club_id, variant, process_id)
-                            if variant_id:
-                                local_variants.append({**variant, "id": variant_id, "club_id": club_id})
-                        else:
-                            local_variants.append({**variant, "id": variant_id, "club_id": club_id})
-            finally:
-                conn.close()
-            
-            time.sleep(random.uniform(0.3, 0.7))
-        
-            browser.close()
-            print(f"Process {process_id} - Finished scraping {name} with {len(local_variants)} variants")
+                    details = passive_variant_details(row, details_index)
+                    if details:
+                        passive_details += 1
+                    else:
+                        details = await get_variant_details_async(page, variant_locator.nth(variant_idx - 1), process_id, variant_idx, variant_count)
+                    
+                    result = build_variant_entry(row["cells"], header_labels, row["price"], details, club_type, brand, model,
+                                                 handicapper_level, category, image_filename, url, process_id, variant_idx)
+                    if result:
+                        group_key, variant_entry = result
+                        variant_groups[group_key].append(variant_entry)
+                except Exception as e:
+                    log.error(f"Error extracting variant {variant_idx}/{variant_count}: {e}")
             
+            log.debug(f"Read sub-details for {passive_details}/{variant_count} variants without clicking")
+            local_variants = await asyncio.to_thread(save_variant_groups, variant_groups, handicapper_level, category, image_filename, process_id)
+            log.info(f"Finished scraping {name} with {len(local_variants)} variants")
             return local_variants
-    
+        finally:
+            try:
+                await context.close()
+            except Exception as e:
+                log.error(f"Error closing browser context: {e}")
+            log_router_stats(router_stats, url, process_id)
     except Exception as e:
-        print(f"Process {process_id} - Error scraping product page {url}: {e}")
+        log.error(f"Error scraping product page {url}: {e}")
+        _item_errors[url] = str(e)
         return local_variants
 
+def next_work_item(work_queue):
+    """Lease the next scheduled item from the shared work queue, or None when done or stopping."""
+    if stop_requested():
+        return None
+    try:
+        return work_queue.get_nowait()
+    except Empty:
+        return None
+
+async def crawl_async(work_queue, process_id, total_items, concurrency, per_host_limit):
+    """Scrape items from the shared work queue with up to `concurrency` pages open at once in one event loop."""
+    host_semaphores = {}
+    variant_count = 0
+    progress = tqdm(desc=f"Scraping equipment (process {process_id})", position=process_id)
+    
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        
+        async def page_worker():
+            nonlocal variant_count
+            while True:
+                item = await asyncio.to_thread(next_work_item, work_queue)
+                if item is None:
+                    return
+                item_index, name, url = item
+                started = time.time()
+                async with get_host_semaphore(host_semaphores, url, per_host_limit):
+                    with log_context(worker=process_id, url=url), timed_stage("page_total"):
+                        variants = await scrape_equipment_async(browser, name, url, process_id, total_items, item_index)
+                count_event("pages")
+                count_event("variants", len(variants))
+                # Snapshot on the loop thread; only the Manager round trip leaves it
+                await asyncio.to_thread(publish_worker_stats, worker_stats_snapshot())
+                journal_item(name, url, process_id, started, variants)
+                emit_results(variants)
+                variant_count += len(variants)
+                progress.update(1)
+                dump_worker_profile()
+        
+        try:
+            await asyncio.gather(*(page_worker() for _ in range(concurrency)))
+        finally:
+            await browser.close()
+    
+    progress.close()
+    return variant_count
+
+def scrape_journaled_item(args):
+    """Pool entry point: scrape one item and record its outcome in the crawl journal."""
+    name, url, item_index, total_items = args
+    process_id = os.getpid()
+    started = time.time()
+    with log_context(worker=process_id, url=url), timed_stage("page_total"):
+        variants = scrape_equipment((name, url, process_id, total_items, item_index))
+    count_event("pages")
+    count_event("variants", len(variants))
+    publish_worker_stats()
+    journal_item(name, url, process_id, started, variants)
+    emit_results(variants)
+    dump_worker_profile()
+    return len(variants)
+
+def scrape_equipment_shard_async(args):
+    """Pool entry point: run one event loop pulling URLs from the shared work queue; return its variant count."""
+    work_queue, process_id, total_items, concurrency, per_host_limit = args
+    variant_count = asyncio.run(crawl_async(work_queue, process_id, total_items, concurrency, per_host_limit))
+    publish_worker_stats()
+    dump_worker_profile()
+    return variant_count
+
 def determine_wedge_specific_type(loft_str):
     """Determine the specificType for a wedge based on its loft."""
     if not loft_str:
@@ -881,19 +2756,19 @@ def determine_driver_specific_type(loft_str):
     
     return None
 
-def scrape_driver_details():
-    manager = Manager()
-    all_variants = manager.list()
-    
+EQUIPMENT_PATH = os.getenv("SCRAPER_EQUIPMENT_FILE", "equipment_names_and_urls.txt")
+
+def load_equipment_data(path=EQUIPMENT_PATH):
+    """Load the (name, url) list, dropping duplicate URLs."""
     equipment_data = []
-    with open("equipment_names_and_urls.txt", "r") as f:
+    with open(path, "r") as f:
         for line in f:
             if line.startswith("Name:"):
                 name = line.split(", URL: ")[0].replace("Name: ", "").strip()
                 url = line.split(", URL: ")[1].strip()
                 equipment_data.append((name, url))
     
-    print(f"Loaded {len(equipment_data)} equipment items from equipment_names_and_urls.txt")
+    log.info(f"Loaded {len(equipment_data)} equipment items from {path}")
     
     seen_urls = set()
     unique_equipment_data = []
@@ -902,77 +2777,430 @@ def scrape_driver_details():
             seen_urls.add(url)
             unique_equipment_data.append((name, url))
     
-    equipment_data = unique_equipment_data
-    print(f"Total unique equipment items after deduplication: {len(equipment_data)}")
-    print(f"Processing all {len(equipment_data)} equipment items with multiprocessing")
-    
-    num_processes = 8
-    chunk_size = max(1, len(equipment_data) // num_processes)
-    chunks = [equipment_data[i:i + chunk_size] for i in range(0, len(equipment_data), chunk_size)]
+    log.info(f"Total unique equipment items after deduplication: {len(unique_equipment_data)}")
+    return unique_equipment_data
+
+EXCEL_COLUMNS = [
+    "id", "club_id", "type", "subType", "specificType", "brand", "model", "price", "loft", "shaftMaterial",
+    "setMakeup", "length", "bounce", "handicapperLevel", "category", "description", "retailer",
+    "retailer_price", "url", "image"
+]
+
+def variant_export_row(variant):
+    """Flatten a scraped variant into the Excel export columns."""
+    return {
+        "id": variant["id"],
+        "club_id": variant["club_id"],
+        "type": variant["type"],
+        "subType": variant["subType"],
+        "specificType": variant.get("specificType", ""),
+        "brand": variant["brand"],
+        "model": variant["model"],
+        "price": variant["price"],
+        "loft": variant.get("loft", ""),
+        "shaftMaterial": variant.get("shaftMaterial", ""),
+        "setMakeup": variant.get("setMakeup", ""),
+        "length": variant.get("length", ""),
+        "bounce": variant.get("bounce", ""),
+        "handicapperLevel": variant["handicapperLevel"],
+        "category": variant["category"],
+        "description": variant["description"],
+        "retailer": variant["prices"][0]["retailer"],
+        "retailer_price": variant["prices"][0]["price"],
+        "url": variant["prices"][0]["url"],
+        "image": variant.get("image", "")
+    }
+
+def results_path_for_run(run_id):
+    """Return the JSONL file a crawl run's variants are streamed to."""
+    return os.path.join(RESULTS_DIR, f"run_{run_id}.jsonl")
+
+def write_results(result_queue, path, totals):
+    """Append queued variant batches to a JSONL file until a None sentinel arrives."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        while True:
+            variants = result_queue.get()
+            if variants is None:
+                return
+            for variant in variants:
+                f.write(json.dumps(variant, default=str) + "\n")
+            f.flush()
+            totals["variants"] += len(variants)
+
+def export_results_to_excel(results_path, path="equipment_details.xlsx"):
+    """Stream a JSONL results file into an Excel sheet without loading it into memory."""
+    from openpyxl import Workbook
     
-    if len(chunks) > num_processes:
-        chunks[-2].extend(chunks[-1])
-        chunks.pop()
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("equipment_details")
+    sheet.append(EXCEL_COLUMNS)
+    with open(results_path, "r") as f:
+        for line in f:
+            if line.strip():
+                row = variant_export_row(json.loads(line))
+                sheet.append([row[column] for column in EXCEL_COLUMNS])
+    workbook.save(path)
+    log.info(f"Equipment details saved to {path}.")
+
+JOURNAL_SQL = """
+    CREATE TABLE IF NOT EXISTS crawl_runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        engine TEXT NOT NULL,
+        total_items INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'running',
+        started_at REAL NOT NULL,
+        finished_at REAL
+    );
+    CREATE TABLE IF NOT EXISTS crawl_items (
+        run_id INTEGER NOT NULL REFERENCES crawl_runs (id),
+        url TEXT NOT NULL,
+        name TEXT,
+        status TEXT NOT NULL,
+        process_id INTEGER,
+        started_at REAL NOT NULL,
+        seconds REAL NOT NULL,
+        variant_count INTEGER NOT NULL,
+        error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS crawl_items_run_url_idx ON crawl_items (run_id, url);
+    CREATE TABLE IF NOT EXISTS page_versions (
+        url TEXT PRIMARY KEY,
+        etag TEXT,
+        last_modified TEXT,
+        content_hash TEXT,
+        updated_at REAL NOT NULL
+    );
+"""
+
+def open_journal(path=JOURNAL_PATH):
+    """Open the crawl journal, creating its tables on first use."""
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(JOURNAL_SQL)
+    return conn
+
+def start_crawl_run(engine, total_items, resume, path=JOURNAL_PATH):
+    """Start a journal run, or reopen the last unfinished one; return (run_id, completed URLs)."""
+    conn = open_journal(path)
+    try:
+        if resume:
+            last_run = conn.execute("SELECT id, status FROM crawl_runs ORDER BY id DESC LIMIT 1").fetchone()
+            if last_run and last_run[1] != "finished":
+                run_id = last_run[0]
+                completed = {url for (url,) in conn.execute(
+                    "SELECT DISTINCT url FROM crawl_items WHERE run_id = ? AND status IN ('done', 'unchanged')", (run_id,)
+                )}
+                conn.execute("UPDATE crawl_runs SET status = 'running', finished_at = NULL WHERE id = ?", (run_id,))
+                conn.commit()
+                log.info(f"Resuming crawl run {run_id}: {len(completed)} items already done")
+                return run_id, completed
+            log.info("No unfinished crawl run to resume, starting a new one")
+        run_id = conn.execute(
+            "INSERT INTO crawl_runs (engine, total_items, started_at) VALUES (?, ?, ?)",
+            (engine, total_items, time.time())
+        ).lastrowid
+        conn.commit()
+        log.info(f"Started crawl run {run_id} (journal: {path})")
+        return run_id, set()
+    finally:
+        conn.close()
+
+def finish_crawl_run(run_id, status, path=JOURNAL_PATH):
+    """Mark a journal run finished, or interrupted so --resume picks it up."""
+    conn = open_journal(path)
+    try:
+        conn.execute("UPDATE crawl_runs SET status = ?, finished_at = ? WHERE id = ?", (status, time.time(), run_id))
+        conn.commit()
+    finally:
+        conn.close()
+
+def write_journal(run_id, journal_queue, path=JOURNAL_PATH):
+    """Append queued item records to the journal until a None sentinel arrives."""
+    conn = open_journal(path)
+    try:
+        while True:
+            record = journal_queue.get()
+            if record is None:
+                return
+            record = {"run_id": run_id, "updated_at": time.time(), **record}
+            conn.execute(
+                "INSERT INTO crawl_items (run_id, url, name, status, process_id, started_at, seconds, variant_count, error) "
+                "VALUES (:run_id, :url, :name, :status, :process_id, :started_at, :seconds, :variant_count, :error)",
+                record
+            )
+            if record["status"] != "failed":
+                conn.execute(
+                    "INSERT INTO page_versions (url, etag, last_modified, content_hash, updated_at) "
+                    "VALUES (:url, :etag, :last_modified, :content_hash, :updated_at) "
+                    "ON CONFLICT (url) DO UPDATE SET etag = excluded.etag, last_modified = excluded.last_modified, "
+                    "content_hash = excluded.content_hash, updated_at = excluded.updated_at",
+                    record
+                )
+            conn.commit()
+    finally:
+        conn.close()
+
+def load_page_versions(path=JOURNAL_PATH):
+    """Return the stored validators and content hash for every URL seen in earlier runs."""
+    conn = open_journal(path)
+    try:
+        return {
+            url: {"etag": etag, "last_modified": last_modified, "content_hash": content_hash}
+            for url, etag, last_modified, content_hash in conn.execute(
+                "SELECT url, etag, last_modified, content_hash FROM page_versions"
+            )
+        }
+    finally:
+        conn.close()
+
+def install_shutdown_handlers(stop_event):
+    """On the first SIGINT/SIGTERM stop taking new URLs; on the second, abort."""
+    def handle_signal(signum, frame):
+        if stop_event.is_set():
+            raise KeyboardInterrupt
+        log.warning(f"Received {signal.Signals(signum).name}, finishing in-flight items (send again to abort)")
+        stop_event.set()
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+def load_item_history(path=JOURNAL_PATH):
+    """Return each URL's most recent journal status and duration."""
+    conn = open_journal(path)
+    try:
+        return {
+            url: (status, seconds)
+            for url, status, seconds in conn.execute(
+                "SELECT url, status, seconds FROM crawl_items "
+                "WHERE rowid IN (SELECT MAX(rowid) FROM crawl_items GROUP BY url)"
+            )
+        }
+    finally:
+        conn.close()
+
+def schedule_items(equipment_data, completed_urls, history):
+    """Order pending items: new or last-failed URLs first, then longest past duration first."""
+    costs = sorted(seconds for status, seconds in history.values() if status != "failed")
+    default_cost = costs[len(costs) // 2] if costs else 0.0
     
-    print(f"Created {len(chunks)} chunks for {num_processes} processes")
+    def priority(item):
+        status, seconds = history.get(item[1], ("new", default_cost))
+        stale = status in ("new", "failed")
+        return (not stale, -(default_cost if status == "failed" else seconds))
     
-    process_args = []
-    for i, chunk in enumerate(chunks):
-        for idx, (name, url) in enumerate(chunk):
-            global_idx = sum(len(c) for c in chunks[:i]) + idx
-            process_args.append((name, url, i, len(equipment_data), global_idx, all_variants))
+    scheduled = sorted((item for item in equipment_data if item[1] not in completed_urls), key=priority)
+    stale = sum(1 for item in scheduled if not priority(item)[0])
+    estimate = -sum(priority(item)[1] for item in scheduled)
+    log.info(f"Scheduled {len(scheduled)} items ({stale} new or previously failed first), "
+          f"about {estimate / 60:.0f} page-minutes of work")
+    return scheduled
+
+def imap_until_stopped(pool, func, items, window):
+    """Like pool.imap_unordered, but keep at most `window` items leased and stop leasing on shutdown."""
+    finished = Queue()
+    in_flight = 0
+    items = iter(items)
+    while True:
+        while in_flight < window and not stop_requested():
+            item = next(items, None)
+            if item is None:
+                break
+            pool.apply_async(func, (item,), callback=finished.put, error_callback=finished.put)
+            in_flight += 1
+        if not in_flight:
+            return
+        result = finished.get()
+        in_flight -= 1
+        if isinstance(result, BaseException):
+            raise result
+        yield result
+
+def run_async_engine(scheduled, worker_args, work_queue, num_processes, concurrency, per_host_limit):
+    """Scrape with the async engine: one event loop per process, each running `concurrency` pages from the shared queue."""
+    total_items = len(scheduled)
+    for item_index, (name, url) in enumerate(scheduled):
+        work_queue.put((item_index, name, url))
+    num_processes = max(1, min(num_processes, total_items))
+    shard_args = [(work_queue, i, total_items, concurrency, per_host_limit) for i in range(num_processes)]
+    log.info(f"Async engine: {len(shard_args)} processes x {concurrency} concurrent pages ({per_host_limit} per host)")
     
-    processed_items = 0
-    checkpoint_interval = 100
-    total_items = len(process_args)
+    if not total_items:
+        return
+    if len(shard_args) == 1:
+        init_worker(*worker_args)
+        scrape_equipment_shard_async(shard_args[0])
+        return
+    with Pool(processes=len(shard_args), initializer=init_worker, initargs=worker_args) as pool:
+        for _ in pool.imap_unordered(scrape_equipment_shard_async, shard_args):
+            pass
+
+def scrape_driver_details(engine="sync", num_processes=8, concurrency=4, per_host_limit=4, resume=False, full=False,
+                          metrics_path=METRICS_PATH, log_queue=None, profile_dir=None,
+                          equipment_path=EQUIPMENT_PATH):
+    """Crawl every equipment URL; return the run's JSONL results path, its variant count and the unchanged page count."""
+    manager = SyncManager()
+    manager.start(ignore_interrupts)
+    stats_by_worker = manager.dict()
+    journal_queue = manager.Queue()
+    image_queue = manager.Queue()
+    rate_state = manager.dict()
+    rate_lock = manager.Lock()
+    stop_event = manager.Event()
+    work_queue = manager.Queue()
+    result_queue = manager.Queue()
     
-    with Pool(processes=num_processes) as pool:
-        for batch in tqdm(pool.imap(scrape_equipment, process_args), total=total_items, desc="Scraping equipment"):
-            all_variants.extend(batch)
-            processed_items += 1
-            if processed_items % checkpoint_interval == 0:
-                temp_variants = list(all_variants)
-                print(f"Saved checkpoint at item {processed_items} with {len(temp_variants)} variants (stored in database)")
+    equipment_data = load_equipment_data(equipment_path)
+    run_id, completed_urls = start_crawl_run(engine, len(equipment_data), resume)
+    page_versions = {} if full else load_page_versions()
+    if page_versions:
+        log.info(f"Change detection: {len(page_versions)} URLs have stored versions (use --full to rescrape everything)")
+    journal_writer = threading.Thread(target=write_journal, args=(run_id, journal_queue), daemon=True)
+    journal_writer.start()
+    image_stage = threading.Thread(target=run_image_stage, args=(image_queue, load_image_manifest()), daemon=True)
+    image_stage.start()
+    results_path = results_path_for_run(run_id)
+    result_totals = defaultdict(int)
+    result_sink = threading.Thread(target=write_results, args=(result_queue, results_path, result_totals), daemon=True)
+    result_sink.start()
+    install_shutdown_handlers(stop_event)
+    if profile_dir:
+        prepare_profile_dir(profile_dir)
+    worker_args = (stats_by_worker, journal_queue, stop_event, page_versions, image_queue, rate_state, rate_lock,
+                   result_queue, log_queue, profile_dir)
     
-    # Aggregate results for Excel output
-    rows = []
-    for variant in all_variants:
-        row = {
-            "id": variant["id"],
-            "club_id": variant["club_id"],
-            "type": variant["type"],
-            "subType": variant["subType"],
-            "specificType": variant.get("specificType", ""),
-            "brand": variant["brand"],
-            "model": variant["model"],
-            "price": variant["price"],
-            "loft": variant.get("loft", ""),
-            "shaftMaterial": variant.get("shaftMaterial", ""),
-            "setMakeup": variant.get("setMakeup", ""),
-            "length": variant.get("length", ""),
-            "bounce": variant.get("bounce", ""),
-            "handicapperLevel": variant["handicapperLevel"],
-            "category": variant["category"],
-            "description": variant["description"],
-            "retailer": variant["prices"][0]["retailer"],
-            "retailer_price": variant["prices"][0]["price"],
-            "url": variant["prices"][0]["url"],
-            "image": variant.get("image", "")
-        }
-        rows.append(row)
+    run_status = "interrupted"
+    try:
+        scheduled = schedule_items(equipment_data, completed_urls, load_item_history())
+        if engine == "async":
+            run_async_engine(scheduled, worker_args, work_queue, num_processes, concurrency, per_host_limit)
+        else:
+            log.info(f"Processing {len(scheduled)} equipment items with {num_processes} processes")
+            
+            total_items = len(scheduled)
+            process_args = [(name, url, item_index, total_items) for item_index, (name, url) in enumerate(scheduled)]
+            
+            with Pool(processes=num_processes, initializer=init_worker, initargs=worker_args) as pool:
+                for _ in tqdm(imap_until_stopped(pool, scrape_journaled_item, process_args, num_processes + 1),
+                              total=total_items, desc="Scraping equipment"):
+                    pass
+            
+            report_browser_stats(dict(stats_by_worker))
+        if not stop_event.is_set():
+            run_status = "finished"
+    finally:
+        journal_queue.put(None)
+        image_queue.put(None)
+        result_queue.put(None)
+        journal_writer.join()
+        image_stage.join()
+        result_sink.join()
+        finish_crawl_run(run_id, run_status)
+        # A single async shard runs (and is profiled) in this process
+        stop_worker_profiler()
     
-    df = pd.DataFrame(rows)
-    df.to_excel("equipment_details.xlsx", sheet_name="equipment_details", index=False)
-    print("Equipment details saved to equipment_details.xlsx.")
+    if stop_event.is_set():
+        log.warning(f"Crawl run {run_id} interrupted; rerun with --resume to scrape the remaining items")
+    report_db_stats(dict(stats_by_worker))
+    report_club_cache_stats(dict(stats_by_worker))
+    report_page_state_stats(dict(stats_by_worker))
+    report_fetch_tier_stats(dict(stats_by_worker))
+    report_rate_limits(rate_state)
+    # The parent's own timings (image downloads, and in-process async shards) replace its published entry
+    run_stats = dict(stats_by_worker)
+    run_stats[os.getpid()] = {**run_stats.get(os.getpid(), {}), **metrics_snapshot()}
+    report_stage_metrics(run_stats, metrics_path)
+    if profile_dir:
+        report_profiles(profile_dir)
+    print(f"Streamed {result_totals['variants']} variants to {results_path}")
+    # Unchanged pages are skipped, so the run's results (and --excel) only cover pages that changed
+    unchanged = sum(stats.get("page_states", {}).get("unchanged", 0) for stats in run_stats.values())
+    if unchanged:
+        print(f"Skipped {unchanged} unchanged pages; their variants are not in this run's results (use --full for a complete export)")
     
-    return list(all_variants)
+    return results_path, result_totals["variants"], unchanged
+
+def scrape_single_url(url, name=None, profile_dir=None, metrics_path=METRICS_PATH, equipment_path=EQUIPMENT_PATH):
+    """Scrape one URL in this process, without the pool, journal or result sink, e.g. to profile it in isolation."""
+    if name is None:
+        name = dict((item_url, item_name) for item_name, item_url in load_equipment_data(equipment_path)).get(url, url)
+    if profile_dir:
+        prepare_profile_dir(profile_dir)
+    init_worker({}, profile_dir=profile_dir)
+    process_id = os.getpid()
+    try:
+        with log_context(worker=process_id, url=url), timed_stage("page_total"):
+            variants = scrape_equipment((name, url, process_id, 1, 0))
+        count_event("pages")
+        count_event("variants", len(variants))
+    finally:
+        stop_worker_profiler()
+        close_worker_browser()
+    report_stage_metrics({process_id: metrics_snapshot()}, metrics_path)
+    if profile_dir:
+        report_profiles(profile_dir)
+    print(f"Scraped {len(variants)} variants from {url}")
+    return variants
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape golf equipment details into the database.")
+    parser.add_argument("--engine", choices=["sync", "async"], default="sync",
+                        help="sync: one blocking page per process; async: concurrent pages per process")
+    parser.add_argument("--processes", type=int, default=8, help="Number of worker processes")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent pages per process (async engine)")
+    parser.add_argument("--per-host", type=int, default=4, help="Concurrent pages per host per process (async engine)")
+    parser.add_argument("--resume", action="store_true", help="Continue the last unfinished crawl run, skipping completed URLs")
+    parser.add_argument("--full", action="store_true", help="Rescrape every URL, ignoring stored ETags, Last-Modified dates and content hashes")
+    parser.add_argument("--derivatives", action="store_true", help="Build resized WebP image derivatives after scraping")
+    parser.add_argument("--derivatives-only", action="store_true", help="Only build resized WebP image derivatives")
+    parser.add_argument("--excel", action="store_true", help="Export the run's variants to equipment_details.xlsx afterwards")
+    parser.add_argument("--metrics-out", default=METRICS_PATH,
+                        help="Write stage timings and counters to this file (.prom for Prometheus textfile, otherwise JSON)")
+    parser.add_argument("--log-level", default=LOG_LEVEL,
+                        help="DEBUG shows per-variant detail; INFO (default) logs one line per item")
+    parser.add_argument("--log-file", default=LOG_FILE, help="Also write logs to this file as JSON lines")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_DIR or "profiles", default=PROFILE_DIR, metavar="DIR",
+                        help="cProfile every worker and merge the profiles into DIR/merged.prof and DIR/report.txt")
+    parser.add_argument("--url", help="Scrape only this URL in-process (combine with --profile to profile it in isolation)")
+    parser.add_argument("--name", help="Equipment name for --url (looked up in the equipment list by default)")
+    parser.add_argument("--equipment-file", default=EQUIPMENT_PATH, help="Equipment list of 'Name: ..., URL: ...' lines")
+    args = parser.parse_args()
+    log_queue = start_logging(args.log_level, args.log_file)
+    if args.derivatives_only:
+        build_image_derivatives(args.processes)
+        stop_logging()
+        raise SystemExit(0)
+    if args.url:
+        try:
+            scrape_single_url(args.url, args.name, args.profile, args.metrics_out, args.equipment_file)
+        except Exception:
+            log.exception("Script failed")
+        finally:
+            stop_logging()
+        raise SystemExit(0)
     try:
-        equipment_details = scrape_driver_details()
-        if not equipment_details:
+        results_path, variant_count, unchanged_count = scrape_driver_details(
+            engine=args.engine,
+            num_processes=args.processes,
+            concurrency=args.concurrency,
+            per_host_limit=args.per_host,
+            resume=args.resume,
+            full=args.full,
+            metrics_path=args.metrics_out,
+            log_queue=log_queue,
+            profile_dir=args.profile,
+            equipment_path=args.equipment_file
+        )
+        if not variant_count and unchanged_count:
+            print("No pages changed since the last run.")
+        elif not variant_count:
             print("No equipment details found. Check the logs for errors.")
         else:
-            print(f"Total variants processed: {len(equipment_details)}")
-    except Exception as e:
-        print(f"Script failed: {e}")
\ No newline at end of file
+            print(f"Total variants processed: {variant_count}")
+        if args.excel and os.path.exists(results_path):
+            export_results_to_excel(results_path)
+        if args.derivatives:
+            build_image_derivatives(args.processes)
+    except Exception:
+        log.exception("Script failed")
+    finally:
+        stop_logging()
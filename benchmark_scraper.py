@@ -0,0 +1,511 @@
+"""Offline throughput benchmark for GolfBidderScraper.py.
+
+Product pages are recorded once from the live site and then replayed by a local HTTP
+server, so crawls can be timed repeatably without touching golfbidder.co.uk:
+
+    python benchmark_scraper.py record --limit 25
+    python benchmark_scraper.py run --engine async --processes 4 --repeat 3
+    python benchmark_scraper.py run --single
+
+The scraper reaches the server through SCRAPER_SITE_MIRROR, so the static fetches and the
+browser's own requests (Load More, variant tables) are replayed. Popup hosts and blocked
+resource types are aborted by the scraper's request router before they reach the mirror;
+record and run with --with-popups (ideally into a separate --fixtures directory) to turn
+both blocks off and measure popup handling too.
+
+The scraper's writes use Postgres-only SQL, so a throwaway local Postgres
+(SCRAPER_BENCH_DATABASE_URL) stands in for the database; it is emptied before every run.
+Each run's pages/sec, p50/p95 per page and DB round trips are appended to
+benchmarks/results.jsonl and compared with the last comparable run.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import statistics
+import subprocess
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+
+load_dotenv()
+
+SCRAPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "GolfBidderScraper.py")
+FIXTURES_DIR = os.getenv("SCRAPER_BENCH_FIXTURES", os.path.join("benchmarks", "fixtures"))
+RESULTS_PATH = os.getenv("SCRAPER_BENCH_RESULTS", os.path.join("benchmarks", "results.jsonl"))
+BENCH_DATABASE_URL = os.getenv("SCRAPER_BENCH_DATABASE_URL")
+
+# Headers that describe the live connection rather than the recorded response
+HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-encoding", "content-length",
+               "strict-transport-security", "alt-svc", "date", "server"}
+# Request headers not forwarded upstream while recording; conditional ones would record empty 304s
+DROPPED_REQUEST_HEADERS = HOP_HEADERS | {"host", "accept-encoding", "if-none-match", "if-modified-since"}
+
+BENCH_SCHEMA_SQL = """
+    CREATE TABLE IF NOT EXISTS clubs (
+        id SERIAL PRIMARY KEY,
+        brand VARCHAR(255) NOT NULL,
+        model VARCHAR(255) NOT NULL,
+        type VARCHAR(50) NOT NULL,
+        category VARCHAR(50),
+        subType VARCHAR(50),
+        specificType VARCHAR(50),
+        handicapperLevel VARCHAR(50),
+        image VARCHAR(255),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE IF NOT EXISTS variants (
+        id SERIAL PRIMARY KEY,
+        club_id INTEGER REFERENCES clubs(id) ON DELETE CASCADE,
+        price DECIMAL(10, 2) NOT NULL,
+        loft VARCHAR(50),
+        shaftMaterial VARCHAR(50),
+        setMakeup VARCHAR(50),
+        length VARCHAR(50),
+        bounce VARCHAR(50),
+        description TEXT,
+        source VARCHAR(255),
+        url TEXT,
+        fingerprint CHAR(32),
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    -- Must match CLUB_KEY_SQL in GolfBidderScraper.py and the index from migrate_natural_keys.cjs
+    CREATE UNIQUE INDEX IF NOT EXISTS clubs_natural_key_idx ON clubs (brand, model, type, (COALESCE(subtype, '')),
+        (COALESCE(specifictype, '')), (COALESCE(handicapperlevel, '')), (COALESCE(category, '')));
+    CREATE UNIQUE INDEX IF NOT EXISTS variants_fingerprint_idx ON variants (fingerprint);
+"""
+
+def fixture_key(method, host_path, body):
+    """Return the file name stem identifying one recorded request."""
+    digest = hashlib.sha256(f"{method} {host_path}".encode("utf-8"))
+    if body:
+        digest.update(hashlib.sha256(body).digest())
+    return digest.hexdigest()[:32]
+
+def load_fixtures(fixtures_dir):
+    """Load every recorded response into memory, keyed by fixture_key."""
+    fixtures = {}
+    responses_dir = os.path.join(fixtures_dir, "responses")
+    if not os.path.isdir(responses_dir):
+        return fixtures
+    for filename in os.listdir(responses_dir):
+        if not filename.endswith(".json"):
+            continue
+        key = filename[:-len(".json")]
+        with open(os.path.join(responses_dir, filename), "r") as f:
+            meta = json.load(f)
+        with open(os.path.join(responses_dir, f"{key}.body"), "rb") as f:
+            fixtures[key] = (meta["status"], meta["headers"], f.read())
+    return fixtures
+
+def save_fixture(fixtures_dir, key, method, url, status, headers, body):
+    """Write one recorded response as <key>.json metadata plus a <key>.body file."""
+    responses_dir = os.path.join(fixtures_dir, "responses")
+    os.makedirs(responses_dir, exist_ok=True)
+    with open(os.path.join(responses_dir, f"{key}.body"), "wb") as f:
+        f.write(body)
+    with open(os.path.join(responses_dir, f"{key}.json"), "w") as f:
+        json.dump({"method": method, "url": url, "status": status, "headers": headers}, f, indent=2)
+
+class FixtureServer(ThreadingHTTPServer):
+    """Replays recorded responses; in record mode, fetches misses from the live site and saves them."""
+    daemon_threads = True
+
+    def __init__(self, fixtures_dir, record=False, latency=0.0):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        self.fixtures_dir = fixtures_dir
+        self.record = record
+        self.latency = latency
+        self.fixtures = load_fixtures(fixtures_dir)
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+        self.lock = threading.Lock()
+        self.session = requests.Session()
+
+    @property
+    def origin(self):
+        """The base URL the scraper's mirror_url() should point at."""
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        """Serve on a daemon thread; return the mirror origin for SCRAPER_SITE_MIRROR."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.origin
+
+    def count(self, event):
+        """Count a hit or miss."""
+        with self.lock:
+            self.stats[event] += 1
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Handles <mirror>/<host><path>?<query> requests made through mirror_url()."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.replay()
+
+    def do_HEAD(self):
+        self.replay()
+
+    def do_POST(self):
+        self.replay()
+
+    def log_message(self, format, *args):
+        pass
+
+    def replay(self):
+        """Serve the recorded response for this request, recording it first if allowed."""
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        host_path = self.path.lstrip("/")
+        key = fixture_key(self.command, host_path, body)
+        fixture = self.server.fixtures.get(key)
+        if fixture is None and self.server.record:
+            fixture = self.record_upstream(key, host_path, body)
+        if fixture is None:
+            self.server.count("misses")
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.server.count("hits")
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        status, headers, content = fixture
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() == "location":
+                value = self.mirror_location(value, host_path)
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(content)
+
+    def mirror_location(self, location, host_path):
+        """Point a recorded redirect back at the mirror so it is replayed too."""
+        if location.startswith("/"):
+            return f"{self.server.origin}/{host_path.split('/', 1)[0]}{location}"
+        parsed = urlsplit(location)
+        if parsed.scheme in ("http", "https"):
+            return f"{self.server.origin}/{parsed.netloc}{parsed.path or '/'}" + (f"?{parsed.query}" if parsed.query else "")
+        return location
+
+    def record_upstream(self, key, host_path, body):
+        """Fetch a missing response from the live site and save it as a fixture."""
+        url = f"https://{host_path}"
+        headers = {name: value for name, value in self.headers.items() if name.lower() not in DROPPED_REQUEST_HEADERS}
+        try:
+            response = self.server.session.request(self.command, url, headers=headers, data=body or None,
+                                                   allow_redirects=False, timeout=30)
+        except requests.RequestException as e:
+            print(f"Recording {url} failed: {e}")
+            return None
+        recorded_headers = [(name, value) for name, value in response.headers.items() if name.lower() not in HOP_HEADERS]
+        save_fixture(self.server.fixtures_dir, key, self.command, url, response.status_code, recorded_headers, response.content)
+        fixture = (response.status_code, recorded_headers, response.content)
+        with self.server.lock:
+            self.server.fixtures[key] = fixture
+            self.server.stats["recorded"] += 1
+        return fixture
+
+def reset_bench_database(database_url):
+    """Create the clubs/variants schema in the benchmark database and empty it."""
+    import psycopg2
+    conn = psycopg2.connect(database_url)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(BENCH_SCHEMA_SQL)
+            cur.execute("TRUNCATE clubs, variants RESTART IDENTITY CASCADE")
+        conn.commit()
+    finally:
+        conn.close()
+
+def scraper_env(mirror, database_url, work_dir, with_popups=False, replay=True):
+    """Environment for a scraper subprocess: mirrored fetches, a scratch journal, results and images."""
+    env = dict(os.environ)
+    env.update({
+        "SCRAPER_SITE_MIRROR": mirror,
+        "DATABASE_URL": database_url,
+        "SCRAPER_JOURNAL_PATH": os.path.join(work_dir, "journal.sqlite3"),
+        "SCRAPER_RESULTS_DIR": os.path.join(work_dir, "results"),
+        "SCRAPER_IMAGE_DIR": os.path.join(work_dir, "images"),
+        "SCRAPER_IMAGE_MANIFEST": os.path.join(work_dir, "images", "image_manifest.json"),
+        "SCRAPER_LOG_LEVEL": env.get("SCRAPER_LOG_LEVEL", "WARNING"),
+    })
+    if with_popups:
+        # Let popups and every resource through the router so they are recorded and replayed
+        env.update({"SCRAPER_SUPPRESS_POPUPS": "0", "SCRAPER_BLOCK_RESOURCES": "0"})
+    if replay:
+        # The local server is not the live site; don't let the politeness limiter set the pace
+        env.setdefault("SCRAPER_RATE_INITIAL", "1000")
+        env.setdefault("SCRAPER_RATE_MAX", "1000")
+        env.setdefault("SCRAPER_RATE_BURST", "1000")
+    return env
+
+def run_scraper(args, env):
+    """Run GolfBidderScraper.py with the given CLI arguments; return its wall-clock seconds."""
+    started = time.monotonic()
+    subprocess.run([sys.executable, SCRAPER_PATH, *args], env=env, check=True)
+    return time.monotonic() - started
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def load_metrics(path):
+    """Read the scraper's --metrics-out JSON."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+def summarize_pipeline(work_dir, metrics, wall_seconds, server_stats):
+    """Summarize one full crawl from its journal and metrics."""
+    conn = sqlite3.connect(os.path.join(work_dir, "journal.sqlite3"))
+    started_at, finished_at = conn.execute("SELECT started_at, finished_at FROM crawl_runs ORDER BY id DESC LIMIT 1").fetchone()
+    rows = conn.execute("SELECT seconds, status FROM crawl_items").fetchall()
+    conn.close()
+    seconds = [row[0] for row in rows]
+    crawl_seconds = (finished_at or time.time()) - started_at
+    return build_summary(seconds, sum(1 for row in rows if row[1] == "failed"), crawl_seconds, wall_seconds,
+                         metrics, server_stats)
+
+def build_summary(page_seconds, failed, crawl_seconds, wall_seconds, metrics, server_stats):
+    """Collect the numbers stored for one benchmark run."""
+    counters = metrics.get("counters", {})
+    pages = len(page_seconds)
+    stages = metrics.get("stages", {})
+    return {
+        "pages": pages,
+        "failed": failed,
+        "variants": counters.get("variants", 0),
+        "crawl_seconds": round(crawl_seconds, 3),
+        "wall_seconds": round(wall_seconds, 3),
+        "pages_per_sec": round(pages / crawl_seconds, 3) if crawl_seconds else 0.0,
+        "p50": round(percentile(page_seconds, 0.5), 3),
+        "p95": round(percentile(page_seconds, 0.95), 3),
+        "db_round_trips": counters.get("db_round_trips", 0),
+        "db_round_trips_per_page": round(counters.get("db_round_trips", 0) / pages, 2) if pages else 0.0,
+        "fixture_misses": server_stats["misses"],
+        "stage_mean_seconds": {stage: round(metric["sum"] / metric["count"], 4)
+                               for stage, metric in sorted(stages.items()) if metric["count"]},
+    }
+
+def bench_pipeline(options, server, work_dir):
+    """Crawl every fixture URL through scrape_driver_details once."""
+    metrics_path = os.path.join(work_dir, "metrics.json")
+    env = scraper_env(server.origin, options.db_url, work_dir, options.with_popups)
+    reset_bench_database(options.db_url)
+    misses_before = server.stats["misses"]
+    wall_seconds = run_scraper([
+        "--engine", options.engine, "--processes", str(options.processes), "--concurrency", str(options.concurrency),
+        "--full", "--metrics-out", metrics_path, "--equipment-file", os.path.join(options.fixtures, "urls.txt")
+    ], env)
+    return summarize_pipeline(work_dir, load_metrics(metrics_path), wall_seconds,
+                              {"misses": server.stats["misses"] - misses_before})
+
+def bench_single(options, server, work_dir):
+    """Scrape each fixture URL in its own process with --url, timing scrape_equipment without the pool."""
+    env = scraper_env(server.origin, options.db_url, work_dir, options.with_popups)
+    reset_bench_database(options.db_url)
+    misses_before = server.stats["misses"]
+    page_seconds, failed, variants, round_trips, wall_seconds = [], 0, 0, 0, 0.0
+    stages = {}
+    for index, (name, url) in enumerate(read_equipment_file(os.path.join(options.fixtures, "urls.txt"))):
+        metrics_path = os.path.join(work_dir, f"metrics_{index}.json")
+        try:
+            wall_seconds += run_scraper(["--url", url, "--name", name, "--metrics-out", metrics_path], env)
+        except subprocess.CalledProcessError:
+            failed += 1
+            continue
+        metrics = load_metrics(metrics_path)
+        if "page_total" not in metrics["stages"]:
+            failed += 1
+            continue
+        page_seconds.append(metrics["stages"]["page_total"]["sum"])
+        variants += metrics["counters"].get("variants", 0)
+        round_trips += metrics["counters"].get("db_round_trips", 0)
+        for stage, metric in metrics["stages"].items():
+            merged = stages.setdefault(stage, {"count": 0, "sum": 0.0})
+            merged["count"] += metric["count"]
+            merged["sum"] += metric["sum"]
+    metrics = {"stages": stages, "counters": {"variants": variants, "db_round_trips": round_trips}}
+    return build_summary(page_seconds, failed, sum(page_seconds), wall_seconds, metrics,
+                         {"misses": server.stats["misses"] - misses_before})
+
+def read_equipment_file(path):
+    """Read (name, url) pairs from a 'Name: ..., URL: ...' list."""
+    items = []
+    with open(path, "r") as f:
+        for line in f:
+            if line.startswith("Name:") and ", URL: " in line:
+                name, url = line.split(", URL: ", 1)
+                items.append((name.replace("Name: ", "").strip(), url.strip()))
+    return items
+
+def git_revision():
+    """Return the current commit (with a -dirty suffix for local changes), or None outside git."""
+    try:
+        return subprocess.run(["git", "describe", "--always", "--dirty"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(SCRAPER_PATH)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def previous_result(path, entry):
+    """Return the latest stored result with the same fixtures and settings."""
+    keys = ("mode", "fixtures", "fixture_pages", "with_popups", "engine", "processes", "concurrency")
+    previous = None
+    try:
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                if all(result.get(key) == entry.get(key) for key in keys):
+                    previous = result
+    except FileNotFoundError:
+        pass
+    return previous
+
+def store_result(path, entry):
+    """Append a benchmark result to the results file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(entry, sort_keys=True) + "\n")
+
+def compare_results(entry, previous, max_regression):
+    """Print the change from the previous comparable run; return True if it regressed past the threshold."""
+    if previous is None:
+        print("No earlier comparable result to compare against")
+        return False
+    print(f"Compared with {previous.get('revision')} ({previous.get('timestamp')}):")
+    regressed = False
+    for metric, higher_is_better in (("pages_per_sec", True), ("p50", False), ("p95", False), ("db_round_trips_per_page", False)):
+        before, after = previous.get(metric), entry[metric]
+        if not before:
+            continue
+        change = (after - before) / before * 100
+        worse = -change if higher_is_better else change
+        flag = ""
+        if max_regression is not None and worse > max_regression:
+            flag = "  REGRESSION"
+            regressed = True
+        print(f"  {metric:<26}{before:>10}{after:>10}{change:>+9.1f}%{flag}")
+    return regressed
+
+def print_summary(summary):
+    """Print one run's headline numbers."""
+    print(f"{summary['pages']} pages ({summary['failed']} failed), {summary['variants']} variants in "
+          f"{summary['crawl_seconds']:.1f}s: {summary['pages_per_sec']:.2f} pages/s, p50 {summary['p50']:.2f}s, "
+          f"p95 {summary['p95']:.2f}s, {summary['db_round_trips_per_page']} DB round trips/page, "
+          f"{summary['fixture_misses']} fixture misses")
+
+def command_run(options):
+    """Benchmark the scraper against the recorded fixtures and store the result."""
+    urls_path = os.path.join(options.fixtures, "urls.txt")
+    if not os.path.exists(urls_path):
+        raise SystemExit(f"No fixtures in {options.fixtures}; record some first with: {sys.argv[0]} record")
+    server = FixtureServer(options.fixtures, latency=options.latency_ms / 1000)
+    server.start()
+    print(f"Replaying {len(server.fixtures)} recorded responses for {len(read_equipment_file(urls_path))} pages from {server.origin}")
+    summaries = []
+    try:
+        for run in range(options.repeat):
+            with tempfile.TemporaryDirectory(prefix="scraper_bench_") as work_dir:
+                summary = bench_single(options, server, work_dir) if options.single else bench_pipeline(options, server, work_dir)
+            print_summary(summary)
+            summaries.append(summary)
+    finally:
+        server.shutdown()
+    # Store the median run by throughput so one noisy repeat doesn't move the baseline
+    median = sorted(summaries, key=lambda summary: summary["pages_per_sec"])[len(summaries) // 2]
+    entry = {
+        **median,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "label": options.label,
+        "mode": "single" if options.single else "pipeline",
+        "fixtures": os.path.normpath(options.fixtures),
+        "with_popups": options.with_popups,
+        "fixture_pages": len(read_equipment_file(urls_path)),
+        "engine": None if options.single else options.engine,
+        "processes": None if options.single else options.processes,
+        "concurrency": options.concurrency if not options.single and options.engine == "async" else None,
+        "latency_ms": options.latency_ms,
+        "repeat": options.repeat,
+        "pages_per_sec_runs": [summary["pages_per_sec"] for summary in summaries],
+    }
+    if len(summaries) > 1:
+        print(f"Median of {len(summaries)} runs: {median['pages_per_sec']:.2f} pages/s "
+              f"(stdev {statistics.pstdev(entry['pages_per_sec_runs']):.2f})")
+    regressed = compare_results(entry, previous_result(options.results, entry), options.max_regression)
+    store_result(options.results, entry)
+    print(f"Result stored in {options.results}")
+    if regressed:
+        raise SystemExit(1)
+
+def command_record(options):
+    """Crawl a few live pages through the recording server to build the fixture set."""
+    if options.urls:
+        items = read_equipment_file(options.urls)
+    else:
+        items = read_equipment_file(options.equipment_file)[:options.limit]
+    if not items:
+        raise SystemExit("Nothing to record")
+    os.makedirs(options.fixtures, exist_ok=True)
+    with open(os.path.join(options.fixtures, "urls.txt"), "w") as f:
+        for name, url in items:
+            f.write(f"Name: {name}, URL: {url}\n")
+    server = FixtureServer(options.fixtures, record=True)
+    server.start()
+    print(f"Recording {len(items)} pages into {options.fixtures} through {server.origin}")
+    try:
+        with tempfile.TemporaryDirectory(prefix="scraper_record_") as work_dir:
+            env = scraper_env(server.origin, options.db_url, work_dir, options.with_popups, replay=False)
+            reset_bench_database(options.db_url)
+            run_scraper(["--processes", "1", "--full", "--equipment-file", os.path.join(options.fixtures, "urls.txt")], env)
+    finally:
+        server.shutdown()
+    print(f"Recorded {server.stats['recorded']} responses ({len(server.fixtures)} in the fixture set)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraper offline against recorded product pages.")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Fixture directory (urls.txt plus recorded responses)")
+    parser.add_argument("--with-popups", action="store_true",
+                        help="Don't block popups or resources, so popup handling is recorded and replayed too")
+    parser.add_argument("--db-url", default=BENCH_DATABASE_URL,
+                        help="Throwaway local Postgres for the scraper's writes; emptied before every run")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Record live product pages into the fixture directory")
+    record.add_argument("--urls", help="Equipment list of the pages to record (e.g. hand-picked out-of-stock pages)")
+    record.add_argument("--equipment-file", default="equipment_names_and_urls.txt", help="Equipment list to take --limit pages from")
+    record.add_argument("--limit", type=int, default=25, help="Number of pages to record from the equipment list")
+    run = commands.add_parser("run", help="Replay the fixtures and measure throughput")
+    run.add_argument("--single", action="store_true", help="Time scrape_equipment one URL per process instead of the full pipeline")
+    run.add_argument("--engine", choices=["sync", "async"], default="sync")
+    run.add_argument("--processes", type=int, default=4)
+    run.add_argument("--concurrency", type=int, default=4)
+    run.add_argument("--repeat", type=int, default=1, help="Run the benchmark this many times and store the median")
+    run.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every replayed response")
+    run.add_argument("--label", help="Free-form note stored with the result")
+    run.add_argument("--results", default=RESULTS_PATH, help="JSON-lines file results are appended to")
+    run.add_argument("--max-regression", type=float,
+                     help="Exit non-zero if pages/s, p50, p95 or DB round trips/page are this many percent worse")
+    options = parser.parse_args()
+    if not options.db_url:
+        parser.error("set SCRAPER_BENCH_DATABASE_URL or pass --db-url (a local Postgres the benchmark may empty)")
+    if options.db_url == os.getenv("DATABASE_URL"):
+        parser.error("the benchmark database must not be DATABASE_URL; it is truncated before every run")
+    if options.command == "record":
+        command_record(options)
+    else:
+        command_run(options)
@@ -0,0 +1,83 @@
+const { Client } = require('@neondatabase/serverless');
+
+// Load environment variables
+require('dotenv').config();
+
+// Natural keys; CLUB_KEY must match CLUB_KEY_SQL in GolfBidderScraper.py
+// (variants are keyed by fingerprint since migrate_variant_fingerprint.cjs)
+const CLUB_KEY = `brand, model, type, (COALESCE(subtype, '')), (COALESCE(specifictype, '')), (COALESCE(handicapperlevel, '')), (COALESCE(category, ''))`;
+const VARIANT_KEY = `club_id, price, (COALESCE(loft, '')), (md5(COALESCE(description, ''))), (COALESCE(source, '')), (COALESCE(url, ''))`;
+
+console.log('Starting natural key migration...');
+console.log('DATABASE_URL:', process.env.DATABASE_URL ? 'Present' : 'Missing');
+
+const migrate = async () => {
+  const client = new Client({
+    connectionString: process.env.DATABASE_URL,
+  });
+
+  try {
+    console.log('Connecting to Neon Postgres...');
+    await client.connect();
+    console.log('Connected to Neon Postgres successfully');
+
+    await client.query('BEGIN');
+
+    console.log('Re-pointing variants of duplicate clubs...');
+    const repointed = await client.query(`
+      WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY ${CLUB_KEY}) AS keep_id
+        FROM clubs
+      )
+      UPDATE variants v
+      SET club_id = r.keep_id
+      FROM ranked r
+      WHERE v.club_id = r.id AND r.id <> r.keep_id
+    `);
+    console.log(`Re-pointed ${repointed.rowCount} variants`);
+
+    console.log('Deleting duplicate clubs...');
+    const deletedClubs = await client.query(`
+      WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY ${CLUB_KEY}) AS keep_id
+        FROM clubs
+      )
+      DELETE FROM clubs c
+      USING ranked r
+      WHERE c.id = r.id AND r.id <> r.keep_id
+    `);
+    console.log(`Deleted ${deletedClubs.rowCount} duplicate clubs`);
+
+    console.log('Deleting duplicate variants...');
+    const deletedVariants = await client.query(`
+      WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY ${VARIANT_KEY}) AS keep_id
+        FROM variants
+      )
+      DELETE FROM variants v
+      USING ranked r
+      WHERE v.id = r.id AND r.id <> r.keep_id
+    `);
+    console.log(`Deleted ${deletedVariants.rowCount} duplicate variants`);
+
+    console.log('Creating unique natural key indexes...');
+    await client.query(`CREATE UNIQUE INDEX IF NOT EXISTS clubs_natural_key_idx ON clubs (${CLUB_KEY})`);
+    await client.query(`CREATE UNIQUE INDEX IF NOT EXISTS variants_natural_key_idx ON variants (${VARIANT_KEY})`);
+
+    await client.query('COMMIT');
+    console.log('Natural key migration completed successfully');
+  } catch (err) {
+    console.error('Error during migration:', err);
+    await client.query('ROLLBACK').catch(() => {});
+    throw err;
+  } finally {
+    console.log('Closing database connection...');
+    await client.end();
+    console.log('Database connection closed');
+  }
+};
+
+migrate().catch(err => {
+  console.error('Migration failed:', err);
+  process.exit(1);
+});
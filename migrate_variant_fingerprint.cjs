@@ -0,0 +1,77 @@
+const { Client } = require('@neondatabase/serverless');
+
+// Load environment variables
+require('dotenv').config();
+
+// Must stay in sync with variant_fingerprint() in GolfBidderScraper.py; the trailing
+// "Details: ..." part of the description depends on the detail source, so it is left out
+const FINGERPRINT_SQL = `md5(concat_ws(chr(31),
+  club_id::text,
+  price::numeric(10, 2)::text,
+  COALESCE(loft, ''),
+  regexp_replace(COALESCE(description, ''), ', Details: .*$', ''),
+  COALESCE(source, ''),
+  COALESCE(url, '')
+))`;
+
+console.log('Starting variant fingerprint migration...');
+console.log('DATABASE_URL:', process.env.DATABASE_URL ? 'Present' : 'Missing');
+
+const migrate = async () => {
+  const client = new Client({
+    connectionString: process.env.DATABASE_URL,
+  });
+
+  try {
+    console.log('Connecting to Neon Postgres...');
+    await client.connect();
+    console.log('Connected to Neon Postgres successfully');
+
+    await client.query('BEGIN');
+
+    console.log('Adding fingerprint column...');
+    await client.query('ALTER TABLE variants ADD COLUMN IF NOT EXISTS fingerprint CHAR(32)');
+
+    console.log('Deleting variants with duplicate fingerprints...');
+    const deleted = await client.query(`
+      WITH ranked AS (
+        SELECT id, MIN(id) OVER (PARTITION BY ${FINGERPRINT_SQL}) AS keep_id
+        FROM variants
+      )
+      DELETE FROM variants v
+      USING ranked r
+      WHERE v.id = r.id AND r.id <> r.keep_id
+    `);
+    console.log(`Deleted ${deleted.rowCount} duplicate variants`);
+
+    console.log('Backfilling fingerprints...');
+    const backfilled = await client.query(`
+      UPDATE variants SET fingerprint = ${FINGERPRINT_SQL}
+      WHERE fingerprint IS DISTINCT FROM ${FINGERPRINT_SQL}
+    `);
+    console.log(`Backfilled ${backfilled.rowCount} variants`);
+
+    console.log('Creating fingerprint index...');
+    await client.query('CREATE UNIQUE INDEX IF NOT EXISTS variants_fingerprint_idx ON variants (fingerprint)');
+
+    // The fingerprint now decides variant identity, so the wide natural key index is redundant
+    console.log('Dropping superseded natural key index...');
+    await client.query('DROP INDEX IF EXISTS variants_natural_key_idx');
+
+    await client.query('COMMIT');
+    console.log('Variant fingerprint migration completed successfully');
+  } catch (err) {
+    console.error('Error during migration:', err);
+    await client.query('ROLLBACK').catch(() => {});
+    throw err;
+  } finally {
+    console.log('Closing database connection...');
+    await client.end();
+    console.log('Database connection closed');
+  }
+};
+
+migrate().catch(err => {
+  console.error('Migration failed:', err);
+  process.exit(1);
+});